@@ -0,0 +1,39 @@
+import os
+from time import perf_counter
+
+# the agents are only constructed and never invoked, so no api key is needed
+os.environ.setdefault("PRIVAT_OPENROUTER_API_KEY", "benchmark")
+
+from langchain.agents import create_agent
+from langchain_core.messages import SystemMessage
+
+from data_science_agent.dtos.base import LidaEvaluationBase
+from data_science_agent.language import import_language_dto
+from data_science_agent.utils import AGENT_LANGUAGE, get_agent, get_agent_cache_stats, get_llm_model
+from data_science_agent.utils.enums import LLMModel
+
+# agents of the SEVQ evaluation in one run: 3 visualizations, each evaluated by 5 models
+MODELS = [LLMModel.GPT_5, LLMModel.GPT_4o, LLMModel.GEMINI, LLMModel.GROK, LLMModel.CLAUDE_4]
+VISUALIZATIONS = 3
+SYSTEM_PROMPT = "You are a critical, experienced expert in data visualization."
+
+LidaEvaluation = import_language_dto(AGENT_LANGUAGE, LidaEvaluationBase)
+
+
+def construct(factory) -> float:
+    """Constructs the agents of one run and returns the duration in seconds."""
+    start = perf_counter()
+    for _ in range(VISUALIZATIONS):
+        for model in MODELS:
+            factory(model)
+    return perf_counter() - start
+
+
+before = construct(lambda model: create_agent(model=get_llm_model(model), response_format=LidaEvaluation,
+                                              system_prompt=SystemMessage(content=SYSTEM_PROMPT)))
+after = construct(lambda model: get_agent(model=model, response_format=LidaEvaluation,
+                                          system_prompt=SystemMessage(content=SYSTEM_PROMPT)))
+agents = VISUALIZATIONS * len(MODELS)
+print(f"create_agent: {before:.3f} s for {agents} agents ({before / agents * 1000:.1f} ms per agent)")
+print(f"get_agent:    {after:.3f} s for {agents} agents ({after / agents * 1000:.1f} ms per agent)")
+print(f"Cache: {get_agent_cache_stats()}")
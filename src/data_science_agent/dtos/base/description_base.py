@@ -7,13 +7,13 @@ class DescriptionBase(BaseModel):
 
     column_name: str = Field(...)
     count: Optional[float] = None
-    mean: Optional[float] = None
+    mean: Optional[Union[float, str]] = None
     std: Optional[float] = None
-    min: Optional[float] = None
-    percentile_25: Optional[float] = Field(None, alias="25%")
-    percentile_50: Optional[float] = Field(None, alias="50%")
-    percentile_75: Optional[float] = Field(None, alias="75%")
-    max: Optional[float] = None
+    min: Optional[Union[float, str]] = None
+    percentile_25: Optional[Union[float, str]] = Field(None, alias="25%")
+    percentile_50: Optional[Union[float, str]] = Field(None, alias="50%")
+    percentile_75: Optional[Union[float, str]] = Field(None, alias="75%")
+    max: Optional[Union[float, str]] = None
     unique: Optional[int] = None
     top: Optional[Union[int, float, str, bool]] = None
     freq: Optional[int] = None
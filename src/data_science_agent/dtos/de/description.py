@@ -17,25 +17,25 @@ class Description(DescriptionBase):
     count: Optional[float] = Field(
         None, description="Anzahl der nicht‑null Werte (Beobachtungen)."
     )
-    mean: Optional[float] = Field(
+    mean: Optional[Union[float, str]] = Field(
         None, description="Arithmetisches Mittel der Spalte."
     )
     std: Optional[float] = Field(
         None, description="Standardabweichung der Spalte."
     )
-    min: Optional[float] = Field(
+    min: Optional[Union[float, str]] = Field(
         None, description="Kleinster beobachteter Wert."
     )
-    percentile_25: Optional[float] = Field(
+    percentile_25: Optional[Union[float, str]] = Field(
         None, alias="25%", description="25. Perzentil (erstes Quartil)."
     )
-    percentile_50: Optional[float] = Field(
+    percentile_50: Optional[Union[float, str]] = Field(
         None, alias="50%", description="50. Perzentil (Median)."
     )
-    percentile_75: Optional[float] = Field(
+    percentile_75: Optional[Union[float, str]] = Field(
         None, alias="75%", description="75. Perzentil (drittes Quartil)."
     )
-    max: Optional[float] = Field(
+    max: Optional[Union[float, str]] = Field(
         None, description="Größter beobachteter Wert."
     )
 
@@ -17,25 +17,25 @@ class Description(DescriptionBase):
     count: Optional[float] = Field(
         None, description="Number of non-null values (observations)."
     )
-    mean: Optional[float] = Field(
+    mean: Optional[Union[float, str]] = Field(
         None, description="Arithmetic mean of the column."
     )
     std: Optional[float] = Field(
         None, description="Standard deviation of the column."
     )
-    min: Optional[float] = Field(
+    min: Optional[Union[float, str]] = Field(
         None, description="Smallest observed value."
     )
-    percentile_25: Optional[float] = Field(
+    percentile_25: Optional[Union[float, str]] = Field(
         None, alias="25%", description="25th percentile (first quartile)."
     )
-    percentile_50: Optional[float] = Field(
+    percentile_50: Optional[Union[float, str]] = Field(
         None, alias="50%", description="50th percentile (median)."
     )
-    percentile_75: Optional[float] = Field(
+    percentile_75: Optional[Union[float, str]] = Field(
         None, alias="75%", description="75th percentile (third quartile)."
     )
-    max: Optional[float] = Field(
+    max: Optional[Union[float, str]] = Field(
         None, description="Largest observed value."
     )
 
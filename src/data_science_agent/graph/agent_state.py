@@ -1,9 +1,10 @@
-from typing import Any, TypedDict
+from typing import TypedDict
 from langchain_core.messages import HumanMessage, AIMessage
 
 from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.language import import_all_language_dtos
-from data_science_agent.utils import AGENT_LANGUAGE, DurationMetadata, LLMMetadata
+from data_science_agent.utils import AGENT_LANGUAGE, ColumnCompaction, DatasetHandle, DurationMetadata, LLMMetadata, \
+    ProfileErrorBounds, TripleStore, CondensedMetadata
 from data_science_agent.utils.enums import ProgrammingLanguage
 
 all_dtos = import_all_language_dtos(AGENT_LANGUAGE)
@@ -20,15 +21,24 @@ class AgentState(TypedDict):
     statistics_path: str
     # Dataset
     dataset_path: str
-    dataset_df: Any  # any because typing of np.dataframe is not easily possible
+    dataset_cache_key: str  # optional, set if the dataset was prepared for several workers
+    dataset_sheet: str | int  # optional, sheet of Excel workbooks (name or index), the first sheet by default
+    dataset_code_path: str  # file read by the generated code, e.g. the parquet conversion of Excel workbooks
+    dataset: DatasetHandle
     dataset_encoding: str
     dataset_delimiter: str
+    dataset_loader_backend: str
+    dataset_column_mapping: dict[str, str]  # original to cleaned column names
+    dataset_compaction: list[ColumnCompaction]
     # Metadata
     metadata_path: str
-    metadata: list[all_dtos["Metadata"]]
+    metadata: TripleStore  # of all_dtos["Metadata"]
+    metadata_condensed: CondensedMetadata  # optional, metadata of the prompts, if a token budget is set
     # Summary
     column_names: list[str]
     descriptions: list[all_dtos["Description"]]
+    description_error_bounds: list[ProfileErrorBounds]  # only set, if the descriptions were approximated by sketches
+    description_cache_hits: int  # number of column profiles reused from the profile cache
     summary: all_dtos["Summary"]
     # Code Generation and Testing
     regeneration_attempts: int
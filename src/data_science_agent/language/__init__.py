@@ -1,2 +1,2 @@
 from data_science_agent.language.dto_loader import import_language_dto, import_all_language_dtos
-from data_science_agent.language.prompt import Prompt
\ No newline at end of file
+from data_science_agent.language.prompt import Prompt, PromptTemplate, PROMPT_REGISTRY, get_prompt_templates
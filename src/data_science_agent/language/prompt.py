@@ -1,23 +1,104 @@
+import threading
+from dataclasses import dataclass, field
+from string import Formatter
+from typing import Optional
+
 from data_science_agent.utils.enums import Language
+from data_science_agent.utils.tokens import count_tokens
+
+
+@dataclass
+class PromptTemplate:
+    """A template of a prompt, which is parsed once when the prompt is created."""
+    name: str
+    language: Language
+    key: str
+    text: str
+    fields: frozenset[str]  # names of the replacement fields, e.g. {"code", "judge_messages"}
+    rendered: Optional[str] = None  # the rendering of templates without replacement fields
+    _tokens: Optional[int] = field(default=None, repr=False)
+
+    @classmethod
+    def parse(cls, name: str, language: Language, key: str, text: str) -> "PromptTemplate":
+        """Parses the replacement fields of the template, templates without fields are rendered right away."""
+        fields = frozenset(
+            field_name.split(".", 1)[0].split("[", 1)[0]
+            for _, field_name, _, _ in Formatter().parse(text) if field_name is not None
+        )
+        template = cls(name=name, language=language, key=key, text=text, fields=fields)
+        if not fields:
+            # `format` still has to replace the escaped braces ("{{" and "}}")
+            template.rendered = text.format()
+        return template
+
+    def render(self, **fmt) -> str:
+        """Renders the template, the rendering of templates without replacement fields is reused."""
+        if self.rendered is not None:
+            return self.rendered
+        return self.text.format(**fmt)
+
+    def get_chars(self) -> int:
+        """Returns the characters of the template (without the values of the replacement fields)."""
+        return len(self.text)
+
+    def get_tokens(self) -> int:
+        """Returns the tokens of the template (without the values of the replacement fields)."""
+        if self._tokens is None:
+            self._tokens = count_tokens(self.text)
+        return self._tokens
+
+
+# all prompts of the agent by name, filled when the modules defining the prompts are imported
+PROMPT_REGISTRY: dict[str, "Prompt"] = {}
+_registry_lock = threading.Lock()
 
 
 class Prompt:
     """A class representing a prompt for a data science agent."""
 
-    def __init__(self, de: dict, en: dict):
-        """Initialize the prompt with german and english versions."""
+    def __init__(self, de: dict, en: dict, name: str):
+        """
+        Initialize the prompt with german and english versions. The templates are parsed once and the prompt is
+        registered in the `PROMPT_REGISTRY`.
+
+        :param de: The german templates by key.
+        :param en: The english templates by key.
+        :param name: The name of the prompt in the registry, e.g. the name of the node using it.
+        """
+        if not name:
+            raise ValueError("Prompts need a name for the prompt registry.")
         self.de = de
         self.en = en
+        self.name = name
+        with _registry_lock:
+            PROMPT_REGISTRY[name] = self
+        self.templates: dict[Language, dict[str, PromptTemplate]] = {
+            language: {key: PromptTemplate.parse(self.name, language, key, text) for key, text in texts.items()}
+            for language, texts in ((Language.DE, de), (Language.EN, en))
+        }
 
     def get_prompt(self, language: Language, key: str, **fmt):
-        if language == Language.DE:
-            prompt = self.de.get(key, "")
-            if prompt != "":
-                return prompt.format(**fmt)
-        elif language == Language.EN:
-            prompt = self.en.get(key, "")
-            if prompt != "":
-                return prompt.format(**fmt)
-        else:
+        if language not in self.templates:
             raise ValueError(f"Unsupported language: {language}")
-        raise ValueError(f"Prompt for key '{key}' not found in language '{language}'.")
\ No newline at end of file
+        template = self.templates[language].get(key)
+        if template is None or template.text == "":
+            raise ValueError(f"Prompt for key '{key}' not found in language '{language}'.")
+        return template.render(**fmt)
+
+
+def get_prompt_templates(language: Optional[Language] = None) -> list[PromptTemplate]:
+    """
+    Returns the templates of all registered prompts, e.g. to see which templates drive the token usage.
+
+    :param language: Only the templates of this language, all languages if None.
+    :return: The templates ordered by their number of tokens, the largest first.
+    """
+    with _registry_lock:
+        prompts = list(PROMPT_REGISTRY.values())
+    templates = [
+        template
+        for prompt in prompts
+        for templates_language, templates in prompt.templates.items() if language in (None, templates_language)
+        for template in templates.values()
+    ]
+    return sorted(templates, key=lambda template: template.get_tokens(), reverse=True)
@@ -1,11 +1,12 @@
 from data_science_agent.pipeline.code_testing import test_generated_code
 from data_science_agent.pipeline.data_analysis import analyse_dataset
-from data_science_agent.pipeline.data_loading import load_dataset
+from data_science_agent.pipeline.data_loading import load_dataset, prepare_shared_dataset
 from data_science_agent.pipeline.llm_operations.code_generation import llm_generate_r_code, llm_generate_python_code, \
     decide_programming_language
 from data_science_agent.pipeline.llm_operations.summary_generation import llm_generate_summary
 from data_science_agent.pipeline.llm_operations.testing_evaluation import decide_regenerate_code
 from data_science_agent.pipeline.metadata_loading import load_metadata
+from data_science_agent.pipeline.metadata_cache import prepare_shared_metadata
 from data_science_agent.pipeline.llm_operations.code_regeneration import llm_regenerate_code
 from data_science_agent.pipeline.llm_operations.judge_code import llm_judge_code
 from data_science_agent.pipeline.llm_operations.refactor_code import llm_refactor_visualizations
@@ -0,0 +1,115 @@
+import warnings
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+# quantiles of the profile, named like the rows of DataFrame.describe()
+QUANTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+
+def profile_columns(df: DataFrame) -> list[dict[str, Any]]:
+    """
+    Computes the descriptive statistics of all columns, like `df.describe(include="all")`.
+
+    Numeric columns are profiled together on one float matrix: a single sort per column yields the count, min, max and
+    the (linear interpolated) quantiles without further passes. Boolean, string and categorical columns get count,
+    unique, top and freq. The values are plain python types, so the DTOs can be constructed without validation.
+
+    :param df: The DataFrame to profile.
+    :return: One dictionary per column in the order of the columns, keyed by the field names of `DescriptionBase`.
+    """
+    profiles: list[dict[str, Any]] = [{"column_name": str(name)} for name in df.columns]
+
+    numeric_positions = []
+    for position, dtype in enumerate(df.dtypes):
+        column = df.iloc[:, position]
+        if pd.api.types.is_bool_dtype(dtype):
+            profiles[position].update(_profile_categorical(column))
+        elif pd.api.types.is_numeric_dtype(dtype):
+            numeric_positions.append(position)
+        elif pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+            profiles[position].update(_profile_single(column))
+        else:
+            profiles[position].update(_profile_categorical(column))
+
+    if numeric_positions:
+        numeric_profiles = _profile_numeric(df.iloc[:, numeric_positions])
+        for position, profile in zip(numeric_positions, numeric_profiles):
+            profiles[position].update(profile)
+    return profiles
+
+
+def _profile_numeric(df: DataFrame) -> list[dict[str, Any]]:
+    """Profiles the numeric columns, missing values are ignored."""
+    values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    counts = np.count_nonzero(~np.isnan(values), axis=0)
+    # missing values are sorted to the end, so the first count rows of each column are its sorted values
+    sorted_values = np.sort(values, axis=0)
+    columns = np.arange(values.shape[1])
+
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        # columns without values have no statistics (NaN), like describe()
+        warnings.simplefilter("ignore", RuntimeWarning)
+        stats = {
+            "count": counts.astype(np.float64),
+            "mean": np.nanmean(values, axis=0),
+            "std": np.nanstd(values, axis=0, ddof=1),
+            "min": sorted_values[0],
+            "max": sorted_values[np.maximum(counts - 1, 0), columns],
+        }
+        for name, quantile in QUANTILES.items():
+            stats[name] = _sorted_quantile(sorted_values, counts, columns, quantile)
+
+    profiles = [{} for _ in columns]
+    for name, column_stats in stats.items():
+        for profile, value in zip(profiles, column_stats.tolist()):
+            profile[_field_name(name)] = None if np.isnan(value) else value
+    return profiles
+
+
+def _sorted_quantile(sorted_values: np.ndarray, counts: np.ndarray, columns: np.ndarray,
+                     quantile: float) -> np.ndarray:
+    """Returns the linear interpolated quantile of each column (like pandas) from the sorted values."""
+    position = (np.maximum(counts, 1) - 1) * quantile
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    lower_values = sorted_values[lower, columns]
+    upper_values = sorted_values[upper, columns]
+    result = lower_values + (upper_values - lower_values) * (position - lower)
+    return np.where(counts > 0, result, np.nan)
+
+
+def _profile_categorical(column: Series) -> dict[str, Any]:
+    """Profiles a non numeric column by the frequency of its values."""
+    value_counts = column.value_counts()
+    # categoricals also count unused categories
+    value_counts = value_counts[value_counts > 0]
+    profile = {"count": float(column.count()), "unique": int(len(value_counts)), "top": None, "freq": None}
+    if len(value_counts) > 0:
+        profile["top"] = _to_python(value_counts.index[0])
+        profile["freq"] = int(value_counts.iloc[0])
+    return profile
+
+
+def _profile_single(column: Series) -> dict[str, Any]:
+    """Profiles a column with a rarely used dtype (datetimes, timedeltas) with pandas."""
+    profile = {}
+    for name, value in column.describe().items():
+        if pd.isna(value):
+            value = None
+        elif isinstance(value, (pd.Timestamp, pd.Timedelta)):
+            value = value.isoformat()
+        profile[_field_name(name)] = _to_python(value)
+    return profile
+
+
+def _field_name(name: str) -> str:
+    """Returns the field name of `DescriptionBase` for a row name of describe()."""
+    return f"percentile_{name.rstrip('%')}" if name in QUANTILES else name
+
+
+def _to_python(value: Any) -> Any:
+    """Converts numpy scalars to plain python values."""
+    return value.item() if isinstance(value, np.generic) else value
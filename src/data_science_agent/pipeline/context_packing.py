@@ -0,0 +1,185 @@
+from typing import Any, Callable, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from data_science_agent.utils import CONTEXT_TOKEN_BUDGETS, print_color
+from data_science_agent.utils.enums import Color
+from data_science_agent.utils.tokens import count_tokens
+
+# longer text cells of the previews are truncated
+MAX_CELL_CHARS = 80
+# rows kept in a preview, before columns are dropped
+MIN_PREVIEW_ROWS = 3
+# number of dropped column names mentioned in the log
+LOGGED_NAMES = 5
+
+# packs a part of the context to a token budget (0 = unlimited), returns the text and notes about dropped content
+Packer = Callable[[int], tuple[str, list[str]]]
+
+
+def get_context_budget(node: str) -> int:
+    """Returns the token budget of the context of a node, 0 if the context is not limited."""
+    return CONTEXT_TOKEN_BUDGETS.get(node, CONTEXT_TOKEN_BUDGETS.get("default", 0))
+
+
+def pack_context(node: str, parts: dict[str, Packer]) -> dict[str, str]:
+    """
+    Packs the parts of the context of a node (previews, descriptions, summaries, ...) into the token budget of the
+    node. The budget is shared equally, parts needing less than their share leave the rest to the larger parts.
+    Without a budget, the parts are returned unchanged.
+
+    :param node: The name of the node, see `CONTEXT_TOKEN_BUDGETS`.
+    :param parts: The packers of the parts by label.
+    :return: The packed texts by label.
+    """
+    budget = get_context_budget(node)
+    full = {label: pack(0)[0] for label, pack in parts.items()}
+    if budget <= 0:
+        return full
+
+    tokens = {label: count_tokens(text) for label, text in full.items()}
+    packed: dict[str, str] = {}
+    remaining = budget
+    for index, label in enumerate(sorted(parts, key=tokens.get)):
+        share = remaining // (len(parts) - index)
+        if tokens[label] <= share:
+            packed[label] = full[label]
+            remaining -= tokens[label]
+            continue
+        packed[label], notes = parts[label](max(share, 1))
+        packed_tokens = count_tokens(packed[label])
+        remaining -= packed_tokens
+        print_color(
+            f"Context of {node}: {label} packed from {tokens[label]} to {packed_tokens} tokens ({'; '.join(notes)}).",
+            Color.WARNING
+        )
+    return {label: packed[label] for label in parts}
+
+
+def pack_preview(df: Optional[DataFrame], token_budget: int) -> tuple[str, list[str]]:
+    """
+    Packs a preview of a dataset as markdown table: long text cells are truncated first, then rows are dropped down to
+    `MIN_PREVIEW_ROWS` and finally evenly spaced columns are sampled.
+
+    :param df: The preview, e.g. the head or a sample of the dataset.
+    :param token_budget: The maximum number of tokens, 0 for an unchanged preview.
+    :return: The markdown table and notes about the dropped content.
+    """
+    if df is None:
+        return "None", []
+    text = df.to_markdown()
+    tokens = count_tokens(text)
+    if token_budget <= 0 or tokens <= token_budget:
+        return text, []
+
+    notes = []
+    df, truncated_cells = _truncate_cells(df)
+    if truncated_cells:
+        notes.append(f"truncated {truncated_cells} cells to {MAX_CELL_CHARS} characters")
+        text = df.to_markdown()
+        tokens = count_tokens(text)
+
+    rows = len(df)
+    while tokens > token_budget and rows > MIN_PREVIEW_ROWS:
+        rows = max(MIN_PREVIEW_ROWS, min(rows - 1, rows * token_budget // tokens))
+        text = df.head(rows).to_markdown()
+        tokens = count_tokens(text)
+    if rows < len(df):
+        notes.append(f"dropped {len(df) - rows} of {len(df)} rows")
+        df = df.head(rows)
+
+    columns = df.shape[1]
+    while tokens > token_budget and columns > 1:
+        columns = max(1, min(columns - 1, columns * token_budget // tokens))
+        positions = np.unique(np.linspace(0, df.shape[1] - 1, columns).round().astype(int))
+        text = df.iloc[:, positions].to_markdown()
+        tokens = count_tokens(text)
+    if columns < df.shape[1]:
+        dropped = [str(name) for name in df.columns.delete(positions)]
+        notes.append(f"dropped {len(dropped)} of {df.shape[1]} columns ({_names(dropped)})")
+
+    if tokens > token_budget:
+        notes.append(f"still {tokens} tokens")
+    return text, notes
+
+
+def pack_descriptions(descriptions: Optional[list], token_budget: int) -> tuple[str, list[str]]:
+    """
+    Packs the column descriptions: they are abbreviated to one line per column with the statistics, which are set,
+    and the last columns are dropped, if they still exceed the budget.
+
+    :param descriptions: The descriptions (DTOs) of the columns.
+    :param token_budget: The maximum number of tokens, 0 for the unchanged descriptions.
+    :return: The descriptions and notes about the dropped content.
+    """
+    text = str(descriptions)
+    if token_budget <= 0 or not descriptions or count_tokens(text) <= token_budget:
+        return text, []
+
+    notes = ["abbreviated to one line per column"]
+    lines = [_abbreviate_description(description) for description in descriptions]
+    kept, used_tokens = 0, 0
+    for line in lines:
+        line_tokens = count_tokens(line + "\n")
+        if used_tokens + line_tokens > token_budget:
+            break
+        kept += 1
+        used_tokens += line_tokens
+    if kept < len(lines):
+        dropped = [str(description.column_name) for description in descriptions[kept:]]
+        notes.append(f"dropped {len(dropped)} of {len(lines)} columns ({_names(dropped)})")
+    return "\n".join(lines[:kept]), notes
+
+
+def pack_text(text: str, token_budget: int) -> tuple[str, list[str]]:
+    """
+    Packs a text (e.g. a summary) by truncating its end.
+
+    :param text: The text.
+    :param token_budget: The maximum number of tokens, 0 for the unchanged text.
+    :return: The text and notes about the dropped content.
+    """
+    tokens = count_tokens(text)
+    if token_budget <= 0 or tokens <= token_budget:
+        return text, []
+    chars = len(text)
+    packed = text
+    while count_tokens(packed) > token_budget and chars > 0:
+        chars = min(chars - 1, chars * token_budget // max(count_tokens(packed), 1))
+        packed = text[:chars].rstrip() + " …"
+    return packed, [f"truncated {len(text) - chars} of {len(text)} characters"]
+
+
+def _truncate_cells(df: DataFrame) -> tuple[DataFrame, int]:
+    """Truncates the long text cells, returns the preview and the number of truncated cells."""
+    truncated = 0
+
+    def truncate(value: Any) -> Any:
+        nonlocal truncated
+        if isinstance(value, str) and len(value) > MAX_CELL_CHARS:
+            truncated += 1
+            return value[:MAX_CELL_CHARS - 1] + "…"
+        return value
+
+    text_columns = [position for position, dtype in enumerate(df.dtypes) if dtype == object or str(dtype) == "str"]
+    if not text_columns:
+        return df, 0
+    df = df.copy()
+    for position in text_columns:
+        df.isetitem(position, df.iloc[:, position].astype(object).map(truncate))
+    return df, truncated
+
+
+def _abbreviate_description(description) -> str:
+    """Renders the statistics of a column description, which are set, in one line."""
+    statistics = ", ".join(
+        f"{name}={value:.4g}" if isinstance(value, float) else f"{name}={value}"
+        for name, value in description if name != "column_name" and value is not None
+    )
+    return f"{description.column_name}: {statistics}"
+
+
+def _names(names: list[str]) -> str:
+    """Joins the first dropped names for the log."""
+    return ", ".join(names[:LOGGED_NAMES]) + (", …" if len(names) > LOGGED_NAMES else "")
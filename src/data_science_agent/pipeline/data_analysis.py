@@ -1,29 +1,70 @@
-import pandas as pd
+import os
+from typing import Any
 
 from data_science_agent.dtos.base import DescriptionBase
 from data_science_agent.graph import AgentState
 from data_science_agent.language import import_language_dto
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE
+from data_science_agent.pipeline.parallel_profiling import profile_columns_parallel
+from data_science_agent.pipeline.profile_cache import evict_profile_cache, load_or_profile_columns
+from data_science_agent.pipeline.sketch_profiler import sketch_profile_columns
+from data_science_agent.utils import AGENT_LANGUAGE, DATASET_PROFILING_WORKERS, DATASET_SKETCH_PROFILING
 
 Description = import_language_dto(AGENT_LANGUAGE, DescriptionBase)
 
 
-def __convert_nan_to_none(record: dict) -> dict:
-    """Converts a dictionary's NaN values to None."""
-    return {k: (None if pd.isna(v) else v) for k, v in record.items()}
+def _analyse_dataset_details(state: AgentState) -> dict[str, Any]:
+    """Returns the profiling mode, the reused profiles and the largest error bounds of approximated descriptions."""
+    error_bounds = state.get("description_error_bounds")
+    if error_bounds is None:
+        return {
+            "profiling": "exact",
+            "workers": _profiling_workers(),
+            "cached_profiles": state["description_cache_hits"],
+        }
+    details = {"profiling": "sketch", "approximated_columns": sum(not bounds.is_exact() for bounds in error_bounds)}
+    quantile_errors = [bounds.quantile_rank_error for bounds in error_bounds if bounds.quantile_rank_error]
+    if quantile_errors:
+        details["max_quantile_rank_error"] = f"{max(quantile_errors):.4%}"
+    unique_errors = [bounds.unique_relative_error for bounds in error_bounds if bounds.unique_relative_error]
+    if unique_errors:
+        details["unique_relative_error"] = f"{max(unique_errors):.2%}"
+    return details
 
 
-@track_duration
+@track_duration(details=_analyse_dataset_details)
 def analyse_dataset(state: AgentState) -> AgentState:
     """Analysiert den Datensatz und speichert das Analyseergebnis im Zustand."""
-    df: pd.DataFrame = state["dataset_df"]
-    state["column_names"] = list(df.columns)
-
-    desc_df = df.describe(include="all").T.reset_index().rename(columns={"index": "column_name"})
-    desc = [
-        Description(**__convert_nan_to_none(row.to_dict()))
-        for _, row in desc_df.iterrows()
-    ]
-    state["descriptions"] = desc
+    dataset = state["dataset"]
+    state["column_names"] = dataset.columns
+
+    state["description_cache_hits"] = 0
+    if DATASET_SKETCH_PROFILING:
+        # ein Durchlauf über alle Blöcke mit begrenztem Speicher je Spalte, Perzentile und Häufigkeiten sind geschätzt
+        profiles, state["description_error_bounds"] = sketch_profile_columns(dataset.iter_chunks(), dataset.schema)
+    elif _profiling_workers() > 1 and len(dataset.columns) > 1:
+        # die Spalten werden auf mehrere Threads / Prozesse verteilt, die Reihenfolge der Spalten bleibt erhalten
+        profiles, state["description_cache_hits"] = profile_columns_parallel(dataset, _profiling_workers())
+    elif dataset.streamed:
+        # der Datensatz passt nicht in den Speicher, daher wird jede Spalte einzeln geladen und beschrieben
+        profiles = []
+        for column in dataset.columns:
+            column_profiles, cache_hits = load_or_profile_columns(dataset.get_columns([column]))
+            profiles.extend(column_profiles)
+            state["description_cache_hits"] += cache_hits
+    else:
+        # unveränderte Spalten (z. B. eines neuen Snapshots) übernehmen ihr Profil aus dem Cache
+        profiles, state["description_cache_hits"] = load_or_profile_columns(dataset.to_pandas())
+    evict_profile_cache()
+
+    # die Profile enthalten bereits die passenden Typen, daher werden die DTOs ohne Validierung erzeugt
+    state["descriptions"] = [Description.model_construct(**profile) for profile in profiles]
+
+    # die folgenden Knoten benötigen nur noch die Vorschauen des Datensatzes
+    state["dataset"].release()
     return state
+
+
+def _profiling_workers() -> int:
+    """Returns the number of workers profiling the columns."""
+    return DATASET_PROFILING_WORKERS or os.cpu_count() or 1
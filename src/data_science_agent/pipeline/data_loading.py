@@ -1,15 +1,33 @@
-import csv
+import os
 import re
-from typing import Any
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Iterator, Optional
 
-import chardet
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from pandas import DataFrame
+from pandas._libs.parsers import STR_NA_VALUES
 
 from data_science_agent.graph import AgentState
+from data_science_agent.pipeline.dataset_cache import (
+    CachedDataset,
+    dataset_cache_key,
+    is_dataset_cache_enabled,
+    load_cached_dataset,
+    store_cached_dataset
+)
 
 import pandas as pd
 
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
+from data_science_agent.pipeline.dataset_preview import CHUNK_ROWS, build_streaming_preview
+from data_science_agent.pipeline.dialect_sniffing import DEFAULT_DELIMITER, Dialect, sniff_dialect
+from data_science_agent.pipeline.excel_conversion import Sheet, convert_excel_to_parquet, read_excel
+from data_science_agent.pipeline.file_formats import EXCEL_FORMATS, TEXT_FORMATS, detect_format, open_decompressed
+from data_science_agent.pipeline.dtype_compaction import compact_dtypes
+from data_science_agent.utils import DATASET_COMPACT_DTYPES, DATASET_STREAMING_MIN_MB, DatasetHandle, print_color
+from data_science_agent.utils.enums import Color
 
 """
 Parts of this code are adopted from the Microsoft LIDA project:
@@ -37,13 +55,217 @@ Citation:
 """
 
 
-@track_duration
+# csv parser backends ordered from fastest to most lenient
+CSV_BACKENDS = ("pyarrow", "c", "python")
+
+
+def _load_dataset_details(state: AgentState) -> dict[str, Any]:
+    """Returns the details of the dataset loading for the duration statistics."""
+    details = {"loader_backend": state["dataset_loader_backend"]}
+    if state["dataset_compaction"]:
+        saved_bytes = sum(compaction.get_saved_bytes() for compaction in state["dataset_compaction"])
+        details["memory_saved"] = f"{saved_bytes / 1024 / 1024:.2f} MB"
+    return details
+
+
+@track_duration(details=_load_dataset_details)
 def load_dataset(state: AgentState) -> AgentState:
-    """Loads dataset and saves it as a dataframe in the agent state."""
-    state["dataset_df"], state["dataset_delimiter"], state["dataset_encoding"] = read_dataframe(state["dataset_path"])
+    """
+    Loads dataset and saves a handle of it in the agent state.
+    Already parsed datasets are loaded from the dataset cache, which skips the dialect detection and parsing.
+    If enabled, the dtypes of the dataframe are compacted afterward to reduce its memory usage.
+    Large csv / tsv datasets are not loaded as a whole, only their previews are collected in one streaming pass.
+    """
+    if _should_stream(state["dataset_path"]):
+        return _load_streamed_dataset(state)
+
+    sheet = state.get("dataset_sheet")
+    cache_key = None
+    if not is_dataset_cache_enabled():
+        dataset = CachedDataset(*read_dataframe(state["dataset_path"], sheet=sheet))
+    else:
+        # the key is already known, if the dataset was prepared by the parent process (see prepare_shared_dataset)
+        cache_key = state.get("dataset_cache_key") or dataset_cache_key(state["dataset_path"], sheet)
+        dataset = _load_or_parse_dataset(state["dataset_path"], cache_key, sheet)
+
+    state["dataset_delimiter"] = dataset.delimiter
+    state["dataset_encoding"] = dataset.encoding
+    state["dataset_loader_backend"] = dataset.loader_backend
+    state["dataset_column_mapping"] = dataset.column_mapping
+    state["dataset_code_path"] = state["dataset_path"]
+    if is_dataset_cache_enabled() and detect_format(state["dataset_path"])[0] in EXCEL_FORMATS:
+        # the generated scripts read the columnar copy instead of parsing the workbook again
+        state["dataset_code_path"] = convert_excel_to_parquet(
+            state["dataset_path"], sheet, dataset.df, dataset.column_mapping
+        ) or state["dataset_path"]
+    state["dataset_compaction"] = compact_dtypes(dataset.df) if DATASET_COMPACT_DTYPES else []
+    state["dataset"] = DatasetHandle.from_dataframe(
+        state["dataset_path"],
+        dataset.df,
+        partial(_load_dataset_columns, state["dataset_path"], cache_key, sheet)
+    )
+
+    for compaction in state["dataset_compaction"]:
+        print_color(
+            f"Compacted column '{compaction.column_name}' from {compaction.old_dtype} to {compaction.new_dtype}, "
+            f"saved {compaction.get_saved_bytes() / 1024:.1f} KB",
+            Color.OK_BLUE
+        )
+    return state
+
+
+def prepare_shared_dataset(file_location: str, sheet: Optional[Sheet] = None) -> Optional[str]:
+    """
+    Parses a dataset into the dataset cache, before several worker processes load it. The workers then memory map the
+    same cache entry instead of parsing the file and holding a private copy each.
+
+    :param file_location: The path to the dataset file.
+    :param sheet: The sheet of Excel workbooks, the first sheet is used for None.
+    :return: The cache key to pass as `dataset_cache_key` in the agent state of the workers or None, if the cache is
+        disabled, the dataset is streamed by the workers (see load_dataset) or the dataset could not be parsed.
+    """
+    if not is_dataset_cache_enabled() or _should_stream(file_location):
+        return None
+
+    cache_key = dataset_cache_key(file_location, sheet)
+    try:
+        _load_or_parse_dataset(file_location, cache_key, sheet)
+    except Exception as e:
+        # the workers fail with the same error and report it for their run
+        print_color(f"Could not prepare dataset {file_location}: {e}", Color.WARNING)
+        return None
+    return cache_key
+
+
+def _should_stream(file_location: str) -> bool:
+    """Checks whether the dataset is too large to be loaded as a whole."""
+    return DATASET_STREAMING_MIN_MB > 0 and detect_format(file_location)[0] in ('csv', 'tsv', 'jsonl') \
+        and os.path.getsize(file_location) > DATASET_STREAMING_MIN_MB * 1024 * 1024
+
+
+def _load_streamed_dataset(state: AgentState) -> AgentState:
+    """Saves a handle of a large dataset in the agent state, which only holds the previews collected by streaming."""
+    file_location = state["dataset_path"]
+    if detect_format(file_location)[0] == 'jsonl':
+        dialect = Dialect(encoding='utf-8', delimiter=DEFAULT_DELIMITER, header="")
+        delimiter = dialect.delimiter
+        backends = ["json"]
+    else:
+        dialect, delimiter = _sniff_text_dialect(file_location)
+        # the pyarrow backend does not support chunks
+        backends = [backend for backend in _select_csv_backends(delimiter, dialect.header) if backend != "pyarrow"]
+
+    preview = None
+    for backend in backends:
+        try:
+            preview = build_streaming_preview(_iter_chunks(file_location, backend, dialect.encoding, delimiter))
+            break
+        except Exception as e:
+            if backend == backends[-1]:
+                raise
+            print(f"Backend '{backend}' rejected file: {file_location}. Error: {e}")
+
+    # the previews are small, so the columns are cleaned the same way as for loaded datasets
+    column_mapping = clean_column_names(preview.head)
+    clean_column_names(preview.sample)
+
+    state["dataset_delimiter"] = delimiter
+    state["dataset_encoding"] = dialect.encoding
+    state["dataset_loader_backend"] = f"{backend}-stream"
+    state["dataset_column_mapping"] = column_mapping
+    state["dataset_code_path"] = file_location
+    state["dataset_compaction"] = []
+    state["dataset"] = DatasetHandle(
+        path=file_location,
+        schema={column_mapping.get(name, name): dtype for name, dtype in preview.schema.items()},
+        row_count=preview.row_count,
+        loader=partial(_read_streamed_columns, file_location, dialect.encoding, delimiter, backend, column_mapping),
+        previews={"head": preview.head, "sample": preview.sample},
+        streamed=True,
+        chunk_loader=partial(_iter_clean_chunks, file_location, backend, dialect.encoding, delimiter),
+    )
+    print_color(f"Dataset is streamed, {preview.row_count} rows were previewed without loading them.", Color.OK_BLUE)
     return state
 
 
+def _read_streamed_columns(file_location: str, encoding: str, delimiter: str, backend: str,
+                           column_mapping: dict[str, str], columns: Optional[list[str]]) -> DataFrame:
+    """Reads (the given columns of) a streamed dataset, only the requested columns are kept in memory."""
+    use_columns = None
+    if columns is not None:
+        original_names = {cleaned: original for original, cleaned in column_mapping.items()}
+        use_columns = [original_names.get(column, column) for column in columns]
+
+    if backend == "json":
+        # the json reader has no column selection, so the columns are selected chunk by chunk
+        chunks = _iter_chunks(file_location, backend, encoding, delimiter)
+        df = pd.concat(
+            [chunk if use_columns is None else chunk[use_columns] for chunk in chunks],
+            ignore_index=True
+        )
+    else:
+        with _open_source(file_location) as source:
+            df = pd.read_csv(source, encoding=encoding, sep=delimiter, engine=backend, usecols=use_columns)
+    clean_column_names(df)
+    return df if columns is None else df[columns]
+
+
+def _open_source(file_location: str):
+    """
+    Opens the source for a pandas reader: the path of uncompressed files and a decompressing stream for compressed
+    files, so compressed files are never decompressed to disk.
+    """
+    if detect_format(file_location)[1] is None:
+        return nullcontext(file_location)
+    return open_decompressed(file_location)
+
+
+def _iter_chunks(file_location: str, backend: str, encoding: str, delimiter: str) -> Iterator[DataFrame]:
+    """Yields the chunks of a csv / tsv (c or python backend) or line delimited json file (json backend)."""
+    with _open_source(file_location) as source:
+        if backend == "json":
+            reader = pd.read_json(source, lines=True, encoding=encoding, chunksize=CHUNK_ROWS)
+        else:
+            reader = pd.read_csv(source, engine=backend, encoding=encoding, sep=delimiter, chunksize=CHUNK_ROWS)
+        with reader:
+            yield from reader
+
+
+def _iter_clean_chunks(file_location: str, backend: str, encoding: str, delimiter: str) -> Iterator[DataFrame]:
+    """Yields the chunks of a streamed dataset with cleaned column names."""
+    for chunk in _iter_chunks(file_location, backend, encoding, delimiter):
+        clean_column_names(chunk)
+        yield chunk
+
+
+def _load_dataset_columns(file_location: str, cache_key: Optional[str], sheet: Optional[Sheet],
+                          columns: Optional[list[str]]) -> DataFrame:
+    """Loads (the given columns of) an already loaded dataset again, used to materialise the dataset handle."""
+    dataset = load_cached_dataset(cache_key, columns) if cache_key else None
+    if dataset is not None:
+        df = dataset.df
+    else:
+        # not cached or evicted in the meantime
+        df = read_dataframe(file_location, sheet=sheet)[0]
+        if columns is not None:
+            df = df[columns]
+
+    if DATASET_COMPACT_DTYPES:
+        compact_dtypes(df)
+    return df
+
+
+def _load_or_parse_dataset(file_location: str, cache_key: str, sheet: Optional[Sheet]) -> CachedDataset:
+    """Loads the dataset from the cache or parses and caches it, if it is not cached yet."""
+    dataset = load_cached_dataset(cache_key)
+    if dataset is None:
+        dataset = CachedDataset(*read_dataframe(file_location, sheet=sheet))
+        store_cached_dataset(cache_key, dataset)
+    else:
+        dataset.loader_backend = "cache"
+    return dataset
+
+
 def clean_column_name(col_name: str) -> str:
     """
     Clean a single column name by replacing special characters and spaces with underscores.
@@ -56,29 +278,133 @@ def clean_column_name(col_name: str) -> str:
     return re.sub(r'[^0-9a-zA-Z_]', '_', col_name)
 
 
-def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
+def clean_column_names(df: pd.DataFrame) -> dict[str, str]:
     """
-    Clean all column names in the given DataFrame.
+    Clean all column names in the given DataFrame. The columns are renamed in place, the data is not copied.
 
-    ** Copy from LIDA project **
+    ** Modified copy from LIDA project **
 
     :param df: The DataFrame with possibly dirty column names.
-    :return: A copy of the DataFrame with clean column names.
+    :return: The mapping of the original to the clean names of all renamed columns.
     """
-    cleaned_df = df.copy()
-    cleaned_df.columns = [clean_column_name(col) for col in cleaned_df.columns]
-    return cleaned_df
+    original_columns = df.columns.tolist()
+    cleaned_columns = [clean_column_name(col) for col in original_columns]
+    df.columns = cleaned_columns
+    return {
+        original: cleaned
+        for original, cleaned in zip(original_columns, cleaned_columns)
+        if original != cleaned
+    }
+
+
+def _select_csv_backends(delimiter: str, header: Optional[str] = None) -> list[str]:
+    """Selects the csv parser backends, which can handle the sniffed dialect, ordered from fastest to slowest."""
+    if len(delimiter) != 1:
+        # only the python engine supports separators longer than one character
+        return ["python"]
+    if header is not None and delimiter not in header:
+        # single column files are mostly free text, the engines differ in how they skip (quoted) blank lines there
+        return ["python"]
+    return list(CSV_BACKENDS)
+
+
+def _read_csv_pyarrow(file_location: str, encoding: str, delimiter: str) -> DataFrame:
+    """Reads a csv file with the multithreaded pyarrow reader."""
+    read_options = pa_csv.ReadOptions(encoding=encoding, use_threads=True)
+    parse_options = pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True)
+
+    # infer the schema from the first block, this is cheap compared to the full read
+    with pa_csv.open_csv(file_location, read_options=read_options, parse_options=parse_options) as reader:
+        schema = reader.schema
+
+    # pandas names empty or duplicated headers itself, so we let the other engines handle those files
+    if "" in schema.names or len(set(schema.names)) != len(schema.names):
+        raise ValueError("Empty or duplicated column names in header.")
+
+    # the pandas engines keep dates as strings, read empty columns as float and empty strings as missing values,
+    # so we do the same to get identical results for every backend
+    column_types = {f.name: pa.string() for f in schema if pa.types.is_temporal(f.type)}
+    column_types.update({f.name: pa.float64() for f in schema if pa.types.is_null(f.type)})
+    convert_options = pa_csv.ConvertOptions(
+        column_types=column_types,
+        null_values=sorted(STR_NA_VALUES),
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(
+        file_location,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options
+    )
+    return table.to_pandas()
+
+
+def read_csv(file_location: str, encoding: str, delimiter: str, header: Optional[str] = None) -> tuple[DataFrame, str]:
+    """
+    Reads a csv file with the fastest backend, which accepts the file.
+
+    The backends are tried in the order of `CSV_BACKENDS`, the python engine is only used if all faster parsers reject
+    the file.
+
+    :param file_location: The path to the csv file.
+    :param encoding: Encoding of the file.
+    :param delimiter: Delimiter of the file.
+    :param header: Decoded header line of the file, used to select the backends.
+    :return: The DataFrame and the name of the used backend.
+    """
+    def read_pandas(**kwargs) -> DataFrame:
+        with _open_source(file_location) as source:
+            return pd.read_csv(source, encoding=encoding, delimiter=delimiter, **kwargs)
+
+    # pyarrow decompresses compressed files itself
+    read_funcs = {
+        'pyarrow': lambda: _read_csv_pyarrow(file_location, encoding, delimiter),
+        'c': lambda: read_pandas(engine='c', low_memory=False),
+        'python': lambda: read_pandas(engine='python'),
+    }
+
+    backends = _select_csv_backends(delimiter, header)
+    for backend in backends:
+        try:
+            return read_funcs[backend](), backend
+        except Exception as e:
+            if backend == backends[-1]:
+                raise
+            print(f"Backend '{backend}' rejected file: {file_location}. Error: {e}")
+
 
+def _sniff_text_dialect(file_location: str) -> tuple[Dialect, str]:
+    """Returns the dialect of a csv / tsv file and the delimiter to use, tsv files are always tab separated."""
+    dialect = sniff_dialect(file_location)
+    delimiter = "\t" if detect_format(file_location)[0] == 'tsv' else dialect.delimiter
+    return dialect, delimiter
 
-def read_dataframe(file_location: str, encoding: str = 'utf-8') -> tuple[DataFrame, str, Any]:
+
+def _read_json(file_location: str, encoding: str) -> DataFrame:
+    """Reads a (compressed) json file with an array of records."""
+    with _open_source(file_location) as source:
+        return pd.read_json(source, orient='records', encoding=encoding)
+
+
+def _read_json_lines(file_location: str, encoding: str) -> DataFrame:
+    """Reads a (compressed) line delimited json file chunk by chunk, so the raw text is never held as a whole."""
+    return pd.concat(_iter_chunks(file_location, 'json', encoding, DEFAULT_DELIMITER), ignore_index=True)
+
+
+def read_dataframe(file_location: str, encoding: str = 'utf-8',
+                   sheet: Optional[Sheet] = None) -> tuple[DataFrame, str, Any, str, dict[str, str]]:
     """
-    Read a dataframe from a given file location and clean its column names.
+    Read a dataframe from a given file location and clean its column names. Text formats (csv, tsv, json, jsonl) may
+    be compressed with gzip (.gz), bzip2 (.bz2) or zstandard (.zst), they are decompressed while reading.
 
     ** Modified copy from LIDA project **
 
     :param file_location: The path to the file containing the data.
     :param encoding: Encoding to use for the file reading.
-    :return: A cleaned DataFrame.
+    :param sheet: The name or index of the sheet of Excel workbooks, the first sheet is used for None.
+    :return: A cleaned DataFrame, the delimiter, the encoding, the name of the used loader backend and the mapping of
+        the original to the cleaned column names.
     """
 
     # with open(file_location, 'rb') as f:
@@ -88,67 +414,40 @@ def read_dataframe(file_location: str, encoding: str = 'utf-8') -> tuple[DataFra
     # encoding = encoding_result['encoding']
     # delimiter = dialect.delimiter
 
-    with open(file_location, 'rb') as f:
-        raw_data = f.read(4096)
-    encoding_guess = chardet.detect(raw_data).get('encoding', encoding) or encoding
-
-    try:
-        preview = raw_data.decode(encoding_guess)
-    except Exception:
-        encoding_guess = 'latin1'
-        preview = raw_data.decode(encoding_guess, errors='ignore')
+    file_format, compression = detect_format(file_location)
 
-    try:
-        dialect = csv.Sniffer().sniff(preview)
+    # only the text formats need the detection of encoding and delimiter
+    if file_format in ('csv', 'tsv'):
+        dialect, delimiter = _sniff_text_dialect(file_location)
+    else:
+        dialect = Dialect(encoding=encoding, delimiter=DEFAULT_DELIMITER, header="")
         delimiter = dialect.delimiter
-    except csv.Error:
-        delimiter = ';'
-
-    file_extension = file_location.split('.')[-1]
 
+    # every reader returns the DataFrame and the name of the used backend
     read_funcs = {
-        'json': lambda: pd.read_json(file_location, orient='records', encoding=encoding),
-        'csv': lambda: pd.read_csv(file_location, engine='python', encoding=encoding_guess, delimiter=delimiter),
-        'xls': lambda: pd.read_excel(file_location, encoding=encoding),
-        'xlsx': lambda: pd.read_excel(file_location, encoding=encoding),
-        'parquet': pd.read_parquet,
-        'feather': pd.read_feather,
-        'tsv': lambda: pd.read_csv(file_location, sep="\t", encoding=encoding)
+        'json': lambda: (_read_json(file_location, encoding), 'json'),
+        'jsonl': lambda: (_read_json_lines(file_location, encoding), 'json'),
+        'csv': lambda: read_csv(file_location, dialect.encoding, delimiter, dialect.header),
+        'xls': lambda: (read_excel(file_location, sheet), 'excel'),
+        'xlsx': lambda: (read_excel(file_location, sheet), 'excel'),
+        'parquet': lambda: (pd.read_parquet(file_location), 'parquet'),
+        'feather': lambda: (pd.read_feather(file_location), 'feather'),
+        'tsv': lambda: read_csv(file_location, dialect.encoding, delimiter, dialect.header)
     }
 
-    if file_extension not in read_funcs:
+    if file_format not in read_funcs or (compression is not None and file_format not in TEXT_FORMATS):
         raise ValueError('Unsupported file type')
 
     try:
-        df = read_funcs[file_extension]()
+        df, backend = read_funcs[file_format]()
     except Exception as e:
         print(f"Failed to read file: {file_location}. Error: {e}")
         raise
 
-    # Clean column names
-    cleaned_df = clean_column_names(df)
-
-    if cleaned_df.columns.tolist() != df.columns.tolist():
-        write_funcs = {
-            'csv': lambda: cleaned_df.to_csv(file_location, index=False, encoding=encoding),
-            'xls': lambda: cleaned_df.to_excel(file_location, index=False),
-            'xlsx': lambda: cleaned_df.to_excel(file_location, index=False),
-            'parquet': lambda: cleaned_df.to_parquet(file_location, index=False),
-            'feather': lambda: cleaned_df.to_feather(file_location, index=False),
-            'json': lambda: cleaned_df.to_json(file_location, orient='records', index=False, default_handler=str),
-            'tsv': lambda: cleaned_df.to_csv(file_location, index=False, sep='\t', encoding=encoding)
-        }
-
-        if file_extension not in write_funcs:
-            raise ValueError('Unsupported file type')
-
-        try:
-            write_funcs[file_extension]()
-        except Exception as e:
-            print(f"Failed to write file: {file_location}. Error: {e}")
-            raise
+    # Clean column names in memory, the source file is never modified
+    column_mapping = clean_column_names(df)
 
-    return cleaned_df, delimiter, encoding
+    return df, delimiter, dialect.encoding, backend, column_mapping
 
 
 def file_to_df(file_location: str):
@@ -0,0 +1,114 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from pandas import DataFrame
+
+from data_science_agent.pipeline.excel_conversion import Sheet, sheet_file_name
+from data_science_agent.utils import DATASET_CACHE_DIR, DATASET_CACHE_MAX_MB, print_color
+from data_science_agent.utils.cache import atomic_write, atomic_write_bytes, evict_lru, file_digest, touch
+from data_science_agent.utils.enums import Color
+
+# bump this version, whenever the loading / cleaning of datasets changes, so outdated entries are not used anymore
+CACHE_VERSION = 4
+DATA_SUFFIX = ".feather"
+INFO_SUFFIX = ".json"
+# the dtype pandas parses string columns into, object or (pandas >= 3) arrow backed strings with NaN as missing value
+DEFAULT_STRING_DTYPE = pd.Series([""]).dtype
+
+
+@dataclass
+class CachedDataset:
+    """A parsed and cleaned dataset together with the detected file dialect."""
+    df: DataFrame
+    delimiter: str
+    encoding: str
+    loader_backend: str
+    column_mapping: dict[str, str]
+
+
+def is_dataset_cache_enabled() -> bool:
+    """Returns whether the parsed dataset cache is enabled."""
+    return DATASET_CACHE_MAX_MB > 0
+
+
+def dataset_cache_key(file_location: str, sheet: Optional[Sheet] = None) -> str:
+    """Returns the cache key of a dataset file, which is based on the file content (and the sheet of workbooks)."""
+    key = f"v{CACHE_VERSION}-{file_digest(file_location)}"
+    if sheet is not None:
+        key += "-" + sheet_file_name(sheet)
+    return key
+
+
+def load_cached_dataset(key: str, columns: Optional[list[str]] = None) -> Optional[CachedDataset]:
+    """
+    Loads a dataset from the cache. The entry is memory mapped, so the numeric columns without missing values (and the
+    string columns with arrow backed strings) reference the mapped file instead of a private copy. All processes
+    loading the same entry share those pages, e.g. the workers of several runs of the same dataset.
+    The dtypes are the same as for parsing the dataset file, so a cache hit does not change schema, profiles or previews.
+
+    :param key: The cache key of the dataset file.
+    :param columns: The columns to load, all columns are loaded for None.
+    :return: The cached dataset or None, if there is no (complete) entry for the key.
+    """
+    stem = os.path.join(DATASET_CACHE_DIR, key)
+    try:
+        with open(stem + INFO_SUFFIX, encoding="utf-8") as f:
+            info = json.load(f)
+        table = feather.read_table(stem + DATA_SUFFIX, columns=columns, memory_map=True)
+        df = table.to_pandas(types_mapper=_map_arrow_type, split_blocks=True)
+    except FileNotFoundError:
+        # not cached yet or evicted by another process in the meantime
+        return None
+    except Exception as e:
+        print_color(f"Could not read cached dataset {key}: {e}", Color.WARNING)
+        return None
+
+    touch(stem + DATA_SUFFIX)
+    return CachedDataset(df=df, **info)
+
+
+def store_cached_dataset(key: str, dataset: CachedDataset) -> None:
+    """
+    Stores a dataset in the cache and evicts the least recently used entries, if the cache exceeds its size limit.
+    Entries are written atomically, so several worker processes can use the cache at the same time.
+
+    :param key: The cache key of the dataset file.
+    :param dataset: The dataset to store.
+    """
+    stem = os.path.join(DATASET_CACHE_DIR, key)
+    info = {
+        "delimiter": dataset.delimiter,
+        "encoding": dataset.encoding,
+        "loader_backend": dataset.loader_backend,
+        "column_mapping": dataset.column_mapping,
+    }
+    try:
+        # the info is written last, entries without info are ignored by the lookup
+        # uncompressed, compressed entries can not be memory mapped
+        atomic_write(
+            stem + DATA_SUFFIX,
+            lambda path: feather.write_feather(dataset.df, path, compression="uncompressed")
+        )
+        atomic_write_bytes(stem + INFO_SUFFIX, json.dumps(info).encode("utf-8"))
+    except Exception as e:
+        # not every DataFrame can be converted to arrow (e.g. mixed types in one column), those are parsed every time
+        print_color(f"Could not cache dataset {key}: {e}", Color.WARNING)
+        return
+
+    evict_lru(DATASET_CACHE_DIR, DATASET_CACHE_MAX_MB * 1024 * 1024, DATA_SUFFIX, (INFO_SUFFIX,))
+
+
+def _map_arrow_type(arrow_type: pa.DataType):
+    """
+    Keeps strings in their arrow buffers, if pandas parses strings into arrow backed strings. Otherwise, strings are
+    converted to object like all other types are converted to the default pandas dtypes.
+    """
+    if isinstance(DEFAULT_STRING_DTYPE, pd.StringDtype) and \
+            (pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)):
+        return DEFAULT_STRING_DTYPE
+    return None
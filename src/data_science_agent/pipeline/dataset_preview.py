@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from data_science_agent.utils.dataset_handle import CHUNK_ROWS, HEAD_ROWS, SAMPLE_RANDOM_STATE, SAMPLE_ROWS
+
+
+@dataclass
+class StreamingPreview:
+    """Previews and schema of a dataset, which were collected without loading the whole dataset."""
+    head: DataFrame
+    sample: DataFrame
+    row_count: int
+    schema: dict[str, str]  # column name to dtype
+
+
+def build_streaming_preview(chunks: Iterator[DataFrame], head_rows: int = HEAD_ROWS, sample_rows: int = SAMPLE_ROWS,
+                            seed: int = SAMPLE_RANDOM_STATE) -> StreamingPreview:
+    """
+    Collects the head rows, a reservoir sample, the row count and the schema of a dataset in one pass over its chunks.
+
+    The reservoir sample is a uniform random sample of `sample_rows` rows (Algorithm R). It is deterministic for a
+    seed and does not depend on the chunk size. Like `DataFrame.sample`, the sampled rows keep their row number as
+    index.
+
+    :param chunks: The chunks of the dataset, e.g. of `pd.read_csv(..., chunksize=...)`.
+    :param head_rows: The number of head rows.
+    :param sample_rows: The size of the reservoir sample.
+    :param seed: The seed of the reservoir sample.
+    :return: The collected previews.
+    """
+    rng = np.random.default_rng(seed)
+    head_parts: list[DataFrame] = []
+    head_count = 0
+    # row number of the sampled row in each slot of the reservoir
+    slots = np.empty(0, dtype=np.int64)
+    sampled: Optional[DataFrame] = None
+    schema: dict[str, np.dtype] = {}
+    row_count = 0
+
+    for chunk in chunks:
+        positions = np.arange(row_count, row_count + len(chunk))
+        row_count += len(chunk)
+        chunk.index = positions
+
+        if head_count < head_rows:
+            head_parts.append(chunk.head(head_rows - head_count))
+            head_count += len(head_parts[-1])
+
+        for name, dtype in chunk.dtypes.items():
+            schema[name] = _common_dtype(schema[name], dtype) if name in schema else dtype
+
+        # the first rows fill the reservoir, every following row i replaces a random slot with probability k / (i + 1)
+        fill = min(sample_rows - len(slots), len(chunk))
+        slots = np.concatenate([slots, positions[:fill]])
+        remaining = positions[fill:]
+        if len(remaining) > 0:
+            targets = rng.integers(0, remaining + 1)
+            replaced = targets < sample_rows
+            # for repeated slots the last assignment wins, like replacing the rows one after another
+            slots[targets[replaced]] = remaining[replaced]
+
+        candidates = chunk if sampled is None else pd.concat([sampled, chunk])
+        sampled = candidates[candidates.index.isin(slots)]
+
+    if sampled is None:
+        raise ValueError("The dataset does not contain any chunk.")
+
+    return StreamingPreview(
+        head=pd.concat(head_parts) if head_parts else sampled.head(0),
+        sample=sampled.loc[slots],
+        row_count=row_count,
+        schema={str(name): str(dtype) for name, dtype in schema.items()},
+    )
+
+
+def _common_dtype(first, second):
+    """Returns the dtype, which can hold the values of both dtypes. The chunks may infer different dtypes."""
+    if first == second:
+        return first
+    if isinstance(first, np.dtype) and isinstance(second, np.dtype) \
+            and first.kind in "biuf" and second.kind in "biuf":
+        return np.promote_types(first, second)
+    return np.dtype(object)
@@ -1,26 +1,42 @@
 import time
 from functools import wraps
+from typing import Any, Callable, Optional
 
 from data_science_agent.graph import AgentState
+from data_science_agent.pipeline.decorator.llm_cache_scope import llm_cache_scope
 from data_science_agent.utils import DurationMetadata
 
 
-def track_duration(func):
-    """Decorator to measure execution time of graph node functions and store in AgentState."""
-    @wraps(func)
-    def wrapper(state: AgentState, *args, **kwargs):
-        start_time = time.time()
+def track_duration(func=None, *, details: Optional[Callable[[AgentState], dict[str, Any]]] = None):
+    """
+    Decorator to measure execution time of graph node functions and store in AgentState.
 
-        # Execute node
-        result_state = func(state, *args, **kwargs)
+    Can be used as ``@track_duration`` or as ``@track_duration(details=...)``. The optional ``details`` callable
+    receives the resulting state and returns additional information, which is stored with the duration.
+    """
+    def decorator(node_func):
+        # the LLM calls of the node are assigned to it for the response cache
+        scoped_func = llm_cache_scope(node_func)
 
-        stop_time = time.time()
-        duration = DurationMetadata(
-            method_name=func.__name__,
-            start=start_time,
-            stop=stop_time,
-        )
+        @wraps(node_func)
+        def wrapper(state: AgentState, *args, **kwargs):
+            start_time = time.time()
 
-        result_state["durations"].append(duration)
-        return result_state
-    return wrapper
\ No newline at end of file
+            # Execute node
+            result_state = scoped_func(state, *args, **kwargs)
+
+            stop_time = time.time()
+            duration = DurationMetadata(
+                method_name=node_func.__name__,
+                start=start_time,
+                stop=stop_time,
+                details=details(result_state) if details else {},
+            )
+
+            result_state["durations"].append(duration)
+            return result_state
+        return wrapper
+
+    if func is None:
+        return decorator
+    return decorator(func)
@@ -0,0 +1,16 @@
+from functools import wraps
+
+
+def llm_cache_scope(node_func):
+    """
+    Decorator to assign the LLM calls of a graph node (or router) to the node by its function name, so the response
+    cache can exclude them (see `LLM_CACHE_EXCLUDED_NODES`). `track_duration` applies it to every node it measures.
+    """
+    @wraps(node_func)
+    def wrapper(*args, **kwargs):
+        # the response cache (and langchain_core) is imported with the first node run, not with the pipeline
+        from data_science_agent.utils.llm_response_cache import llm_cache_node
+
+        with llm_cache_node(node_func.__name__):
+            return node_func(*args, **kwargs)
+    return wrapper
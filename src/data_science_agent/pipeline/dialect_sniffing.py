@@ -0,0 +1,215 @@
+import codecs
+import csv
+import json
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import chardet
+
+from data_science_agent.pipeline.file_formats import detect_format, open_decompressed
+from data_science_agent.utils import print_color
+from data_science_agent.utils.cache import atomic_write_bytes
+from data_science_agent.utils.enums import Color
+
+# bump this version, whenever the detection changes, so outdated sidecar files are not used anymore
+SIDECAR_VERSION = 1
+SIDECAR_SUFFIX = ".dialect.json"
+
+# size of one sample block, files up to three blocks are sampled completely
+SAMPLE_BLOCK_SIZE = 64 * 1024
+# relative positions of the sample blocks in the file (head, middle, tail)
+SAMPLE_POSITIONS = (0.0, 0.5, 1.0)
+# chardet is slow, so it only gets this many bytes of the lines containing non ascii characters
+MAX_DETECTION_BYTES = 16 * 1024
+# less confident guesses are mostly wrong for the short german texts in our datasets, cp1252 fits those better
+MIN_DETECTION_CONFIDENCE = 0.5
+
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+WIDE_ENCODINGS = ("utf-16", "utf-32")
+# the csv sniffer only gets the beginning of the head block, it gets slow for large inputs
+MAX_SNIFF_CHARS = 4096
+# number of lines per block used to score the delimiter candidates
+MAX_SCORED_LINES = 200
+DELIMITER_CANDIDATES = ",;\t|"
+DEFAULT_DELIMITER = ";"
+
+
+@dataclass
+class Dialect:
+    """The detected encoding and delimiter of a text dataset file and its decoded header line."""
+    encoding: str
+    delimiter: str
+    header: str
+
+
+def sniff_dialect(file_location: str) -> Dialect:
+    """
+    Detects the encoding and delimiter of a text dataset file.
+
+    The detection samples blocks from the head, middle and tail of the file, so files whose first block is not
+    representative are detected correctly as well. The result is persisted in a sidecar file next to the dataset and
+    reused as long as the dataset file is unchanged.
+
+    :param file_location: The path to the dataset file.
+    :return: The detected dialect.
+    """
+    stat = os.stat(file_location)
+    sidecar_path = file_location + SIDECAR_SUFFIX
+
+    dialect = _load_sidecar(sidecar_path, stat)
+    if dialect is not None:
+        return dialect
+
+    blocks = _read_sample_blocks(file_location, stat.st_size)
+    encoding = _detect_encoding(blocks)
+    if encoding in WIDE_ENCODINGS:
+        # the line borders of the other blocks are not aligned to the code units of those encodings
+        blocks = blocks[:1]
+    texts = [block.decode(encoding, errors="replace") for block in blocks]
+    # the BOM is only part of the first block
+    texts[0] = texts[0].removeprefix("\ufeff")
+    dialect = Dialect(
+        encoding=encoding,
+        delimiter=_detect_delimiter(texts),
+        header=texts[0].partition("\n")[0].rstrip("\r"),
+    )
+
+    _store_sidecar(sidecar_path, stat, dialect)
+    return dialect
+
+
+def _read_sample_blocks(file_location: str, size: int) -> list[bytes]:
+    """Reads the sample blocks of the file. Partial lines at the borders of the blocks are removed."""
+    if detect_format(file_location)[1] is not None:
+        # compressed streams can not seek, so only the head of the decompressed data is sampled
+        with open_decompressed(file_location) as f:
+            block = f.read(SAMPLE_BLOCK_SIZE * len(SAMPLE_POSITIONS))
+            if f.read(1) and b"\n" in block:
+                block = block[:block.rindex(b"\n") + 1]
+        return [block]
+
+    with open(file_location, "rb") as f:
+        if size <= SAMPLE_BLOCK_SIZE * len(SAMPLE_POSITIONS):
+            return [f.read()]
+
+        blocks = []
+        for position in SAMPLE_POSITIONS:
+            offset = min(int(size * position), size - SAMPLE_BLOCK_SIZE)
+            f.seek(offset)
+            block = f.read(SAMPLE_BLOCK_SIZE)
+            if offset > 0:
+                # the block most likely starts in the middle of a line
+                block = block.partition(b"\n")[2]
+            if offset + SAMPLE_BLOCK_SIZE < size and b"\n" in block:
+                # the block most likely ends in the middle of a line
+                block = block[:block.rindex(b"\n") + 1]
+            blocks.append(block)
+        return blocks
+
+
+def _decodes(blocks: list[bytes], encoding: str) -> bool:
+    """Checks whether all blocks can be decoded with the given encoding."""
+    try:
+        for block in blocks:
+            block.decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+
+def _detect_encoding(blocks: list[bytes]) -> str:
+    """
+    Detects the encoding of the sampled blocks. Byte order marks and valid utf-8 are checked first, which is a lot
+    faster than a statistical detection. Only if both fail, chardet guesses the encoding.
+    """
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if blocks[0].startswith(bom):
+            return encoding
+
+    if _decodes(blocks, "utf-8"):
+        return "utf-8"
+
+    # only lines with non ascii characters are relevant for the guess
+    non_ascii_lines = b"\n".join(line for block in blocks for line in block.splitlines() if not line.isascii())
+    detection = chardet.detect(non_ascii_lines[:MAX_DETECTION_BYTES])
+    guess = detection.get("encoding") if (detection.get("confidence") or 0) >= MIN_DETECTION_CONFIDENCE else None
+
+    # the guess has to decode every sampled block, latin1 decodes everything and is the last resort
+    for encoding in (guess, "cp1252", "latin1"):
+        if encoding and _decodes(blocks, encoding):
+            return encoding
+    return "latin1"
+
+
+def _detect_delimiter(texts: list[str]) -> str:
+    """
+    Detects the delimiter of the decoded sample blocks. The delimiter of the csv sniffer for the head block is
+    verified against all blocks, if the sniffer fails or its delimiter does not fit, the most consistent delimiter
+    over all sampled lines is used.
+    """
+    lines = [line for text in texts for line in text.splitlines()[:MAX_SCORED_LINES] if line.strip()]
+    scores = _delimiter_scores(lines)
+
+    try:
+        delimiter = csv.Sniffer().sniff(texts[0][:MAX_SNIFF_CHARS], delimiters=DELIMITER_CANDIDATES).delimiter
+        if scores.get(delimiter, 0) > 0:
+            return delimiter
+    except csv.Error:
+        pass
+
+    if scores:
+        return max(scores, key=scores.get)
+    return DEFAULT_DELIMITER
+
+
+def _delimiter_scores(lines: list[str]) -> dict[str, float]:
+    """
+    Scores the delimiter candidates by the share of lines, which contain the most common (non zero) number of
+    delimiters. Quoted text is ignored.
+    """
+    # every second part of a split by quotes is inside of quotes
+    unquoted_lines = ["".join(line.split('"')[::2]) for line in lines]
+    scores = {}
+    for delimiter in DELIMITER_CANDIDATES:
+        counts = Counter(line.count(delimiter) for line in unquoted_lines)
+        counts.pop(0, None)
+        if counts:
+            scores[delimiter] = counts.most_common(1)[0][1] / len(lines)
+    return scores
+
+
+def _load_sidecar(sidecar_path: str, stat: os.stat_result) -> Optional[Dialect]:
+    """Loads the dialect from the sidecar file, if it exists and belongs to the current version of the dataset."""
+    try:
+        with open(sidecar_path, encoding="utf-8") as f:
+            sidecar = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if sidecar.get("version") != SIDECAR_VERSION or sidecar.get("size") != stat.st_size \
+            or sidecar.get("mtime_ns") != stat.st_mtime_ns:
+        return None
+    return Dialect(**sidecar["dialect"])
+
+
+def _store_sidecar(sidecar_path: str, stat: os.stat_result, dialect: Dialect) -> None:
+    """Stores the dialect in the sidecar file next to the dataset."""
+    sidecar = {
+        "version": SIDECAR_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "dialect": asdict(dialect),
+    }
+    try:
+        atomic_write_bytes(sidecar_path, json.dumps(sidecar, ensure_ascii=False).encode("utf-8"))
+    except OSError as e:
+        # e.g. read only dataset directories, we then detect the dialect again next time
+        print_color(f"Could not write dialect sidecar {sidecar_path}: {e}", Color.WARNING)
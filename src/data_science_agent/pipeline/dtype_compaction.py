@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from data_science_agent.utils import ColumnCompaction
+
+# string columns with at most this share of distinct values are converted to categoricals
+MAX_CATEGORY_RATIO = 0.5
+# only ISO 8601 dates are parsed, other formats are ambiguous (e.g. 01.02.2020) and stay strings
+ISO_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?$"
+ARROW_STRING_DTYPE = pd.StringDtype("pyarrow")
+
+
+def compact_dtypes(df: DataFrame) -> list[ColumnCompaction]:
+    """
+    Converts the columns of the DataFrame in place to more memory efficient dtypes. Integers are downcast to the
+    smallest fitting type, floats only if no precision is lost. String columns are converted to datetimes (ISO 8601
+    only), categoricals (low cardinality) or arrow strings. Columns with mixed types are kept as they are.
+
+    :param df: The DataFrame to compact.
+    :return: The dtype changes and the memory usage of the converted columns.
+    """
+    compactions = []
+    for index, column_name in enumerate(df.columns):
+        column = df.iloc[:, index]
+        compacted = _compact_column(column)
+        if compacted is None or compacted.dtype == column.dtype:
+            continue
+
+        bytes_before = int(column.memory_usage(index=False, deep=True))
+        bytes_after = int(compacted.memory_usage(index=False, deep=True))
+        if bytes_after >= bytes_before:
+            continue
+
+        # positional assignment, column names are not necessarily unique
+        df.isetitem(index, compacted)
+        compactions.append(ColumnCompaction(
+            column_name=str(column_name),
+            old_dtype=str(column.dtype),
+            new_dtype=str(compacted.dtype),
+            bytes_before=bytes_before,
+            bytes_after=bytes_after,
+        ))
+    return compactions
+
+
+def _compact_column(column: Series):
+    """Returns the compacted column or None, if the dtype of the column is not compactable."""
+    if pd.api.types.is_bool_dtype(column.dtype):
+        return None
+    if pd.api.types.is_integer_dtype(column.dtype):
+        return pd.to_numeric(column, downcast="integer")
+    if pd.api.types.is_float_dtype(column.dtype):
+        return _downcast_float(column)
+    # object columns (pandas 2) and string columns (pandas 3) may both hold plain strings
+    is_text = column.dtype == object or isinstance(column.dtype, pd.StringDtype)
+    if is_text and pd.api.types.infer_dtype(column, skipna=True) == "string":
+        return _compact_strings(column)
+    return None
+
+
+def _downcast_float(column: Series):
+    """Downcasts a float column to float32, if all values are exactly representable."""
+    downcast = column.astype(np.float32)
+    if np.array_equal(downcast.to_numpy(dtype=np.float64), column.to_numpy(), equal_nan=True):
+        return downcast
+    return None
+
+
+def _compact_strings(column: Series) -> Series:
+    """Converts a string column to datetimes, a categorical or arrow strings."""
+    values = column.dropna()
+    if len(values) > 0 and values.str.fullmatch(ISO_DATE_PATTERN).all():
+        try:
+            return pd.to_datetime(column, format="ISO8601")
+        except (ValueError, OverflowError):
+            # e.g. 2020-13-45, which only looks like a date
+            pass
+
+    if values.nunique() <= MAX_CATEGORY_RATIO * len(values):
+        return column.astype("category")
+    return column.astype(ARROW_STRING_DTYPE)
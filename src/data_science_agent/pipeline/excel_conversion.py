@@ -0,0 +1,85 @@
+import os
+import re
+from typing import Optional, Union
+
+import pandas as pd
+from pandas import DataFrame
+
+from data_science_agent.utils import DATASET_CACHE_DIR, print_color
+from data_science_agent.utils.cache import atomic_write, file_digest
+from data_science_agent.utils.enums import Color
+
+# the conversions are not evicted together with the dataset cache, generated scripts may still read them
+EXCEL_CACHE_DIR = os.path.join(DATASET_CACHE_DIR, "excel")
+# rust based reader, which is a lot faster than openpyxl / xlrd
+EXCEL_ENGINE = "calamine"
+
+Sheet = Union[str, int]
+
+
+def read_excel(file_location: str, sheet: Optional[Sheet] = None) -> DataFrame:
+    """
+    Reads a sheet of an Excel workbook (xls / xlsx). If the sheet was already converted to parquet, the columnar copy
+    is read instead of parsing the workbook again.
+
+    :param file_location: The path to the workbook.
+    :param sheet: The name or index of the sheet, the first sheet is used for None.
+    :return: The DataFrame with the original column names of the sheet.
+    """
+    parquet_path = excel_parquet_path(file_location, sheet)
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path)
+
+    try:
+        workbook = pd.ExcelFile(file_location, engine=EXCEL_ENGINE)
+    except ImportError as e:
+        print_color(f"Excel engine '{EXCEL_ENGINE}' is not available, using the default engine: {e}", Color.WARNING)
+        workbook = pd.ExcelFile(file_location)
+
+    with workbook:
+        if sheet is None and len(workbook.sheet_names) > 1:
+            print_color(
+                f"Workbook {file_location} has the sheets {workbook.sheet_names}, using '{workbook.sheet_names[0]}'. "
+                f"Select another sheet with `dataset_sheet` in the agent state.",
+                Color.WARNING
+            )
+        return workbook.parse(sheet if sheet is not None else 0)
+
+
+def sheet_file_name(sheet: Sheet) -> str:
+    """Returns the sheet name or index as part of a file name."""
+    return re.sub(r'[^0-9a-zA-Z_]', '_', str(sheet))
+
+
+def excel_parquet_path(file_location: str, sheet: Optional[Sheet] = None) -> str:
+    """Returns the path of the parquet conversion of a sheet, it is based on the content of the workbook."""
+    sheet_name = sheet_file_name(sheet if sheet is not None else 0)
+    return os.path.abspath(os.path.join(EXCEL_CACHE_DIR, f"{file_digest(file_location)}-{sheet_name}.parquet"))
+
+
+def convert_excel_to_parquet(file_location: str, sheet: Optional[Sheet], df: DataFrame,
+                             column_mapping: dict[str, str]) -> Optional[str]:
+    """
+    Stores the parsed sheet once as parquet file, which repeat runs and the generated scripts read instead of the
+    workbook.
+
+    :param file_location: The path to the workbook.
+    :param sheet: The name or index of the sheet.
+    :param df: The parsed sheet with cleaned column names.
+    :param column_mapping: The mapping of the original to the cleaned column names.
+    :return: The absolute path of the parquet file or None, if the sheet can not be stored as parquet.
+    """
+    parquet_path = excel_parquet_path(file_location, sheet)
+    if os.path.exists(parquet_path):
+        return parquet_path
+
+    # the copy keeps the original column names, like the workbook
+    original_names = {cleaned: original for original, cleaned in column_mapping.items()}
+    original_df = df.rename(columns=original_names)
+    try:
+        atomic_write(parquet_path, lambda path: original_df.to_parquet(path, index=False))
+    except Exception as e:
+        # e.g. columns with mixed types, the generated scripts read the workbook then
+        print_color(f"Could not convert {file_location} to parquet: {e}", Color.WARNING)
+        return None
+    return parquet_path
@@ -0,0 +1,41 @@
+import os
+from typing import Optional
+
+import pyarrow as pa
+
+# compression suffixes of the dataset files and the matching pyarrow codecs
+COMPRESSIONS = {
+    "gz": "gzip",
+    "bz2": "bz2",
+    "zst": "zstd",
+}
+# formats, which can be read from compressed files
+TEXT_FORMATS = ("csv", "tsv", "json", "jsonl")
+EXCEL_FORMATS = ("xls", "xlsx")
+# line delimited json is stored under both suffixes
+FORMAT_ALIASES = {
+    "ndjson": "jsonl",
+}
+
+
+def detect_format(file_location: str) -> tuple[str, Optional[str]]:
+    """
+    Detects the format of a dataset file by its suffixes, e.g. `data.csv.gz` is a gzip compressed csv file.
+
+    :param file_location: The path to the dataset file.
+    :return: The format (lower case suffix, e.g. `csv`) and the compression codec or None for uncompressed files.
+    """
+    name, extension = os.path.splitext(os.path.basename(file_location))
+    extension = extension.lstrip('.').lower()
+    compression = COMPRESSIONS.get(extension)
+    if compression is not None:
+        extension = os.path.splitext(name)[1].lstrip('.').lower()
+    return FORMAT_ALIASES.get(extension, extension), compression
+
+
+def open_decompressed(file_location: str) -> pa.NativeFile:
+    """
+    Opens a (compressed) dataset file as binary stream, which decompresses the data while reading. pyarrow ships all
+    codecs, so pandas readers do not need the optional compression packages (e.g. zstandard) this way.
+    """
+    return pa.input_stream(file_location, compression=detect_format(file_location)[1])
@@ -1,6 +1,6 @@
 import inspect
+from functools import partial
 
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, AIMessage
 
 from data_science_agent.dtos.base import GoalBase, CodeBase
@@ -8,8 +8,10 @@ from data_science_agent.dtos.wrapper.code import CodeWrapper
 from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt, import_language_dto
+from data_science_agent.pipeline.context_packing import pack_context, pack_preview, pack_text
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE, get_llm_model, LLMMetadata, print_color
+from data_science_agent.pipeline.file_formats import EXCEL_FORMATS, detect_format
+from data_science_agent.utils import AGENT_LANGUAGE, get_agent, LLMMetadata, print_color
 from data_science_agent.utils.enums import LLMModel, ProgrammingLanguage, Color
 from data_science_agent.utils.pipeline import clear_output_dir, archive_images
 
@@ -42,6 +44,15 @@ prompt: Prompt = Prompt(
             "Nutze ausschließlich die folgenden Bibliotheken: pandas, numpy, matplotlib.pyplot, seaborn, geopandas, basemap und plotly.",
         "generate_code_r_lib_instruction": \
             "Installiere und lade alle benötigten Pakete am Anfang des Skripts (füge install.packages/libraries hinzu).",
+        "generate_code_column_mapping_instruction": \
+            "- Spaltennamen: Die Spaltennamen in der Datei weichen von den bereinigten Namen ab. Lade die Datei mit den "
+            "originalen Spaltennamen und benenne die Spalten direkt nach dem Laden mit folgender Zuordnung "
+            "(Originalname -> bereinigter Name) um: `{column_mapping}`",
+        "generate_code_parquet_instruction": \
+            "- Format: Die Datei ist eine Parquet-Datei, Trennzeichen und Encoding entfallen. Lade sie mit "
+            "`pandas.read_parquet` (Python) bzw. `arrow::read_parquet` (R).",
+        "generate_code_sheet_instruction": \
+            "- Tabellenblatt: Lade das Tabellenblatt `{sheet}` der Excel-Datei, Trennzeichen und Encoding entfallen.",
         "generate_code_description_user_prompt": \
             """
                 Du erhältst eine Zusammenfassung des Datensatzes, eine Erklärung aller Spalten und das umzusetzende Visualisierungsziel.
@@ -63,6 +74,8 @@ prompt: Prompt = Prompt(
                 - Pfad zur Datei: `'{dataset_path}'`
                 - Trennzeichen: `'{dataset_sep}'`
                 - Encoding: `'{dataset_encoding}'`
+                {column_mapping_instruction}
+                {dataset_format_instruction}
 
                 Vorgaben für den Code:
                 - Der Code soll direkt ausführbar sein, ohne syntaktische Fehler.
@@ -93,6 +106,8 @@ prompt: Prompt = Prompt(
                 - Pfad zur Datei: `'{dataset_path}'`
                 - Trennzeichen: `'{dataset_sep}'`
                 - Encoding: `'{dataset_encoding}'`
+                {column_mapping_instruction}
+                {dataset_format_instruction}
 
                 Vorgaben für den Code:
                 - Der Code soll direkt ausführbar sein, ohne syntaktische Fehler.
@@ -143,6 +158,15 @@ prompt: Prompt = Prompt(
             "Use only the following libraries: pandas, numpy, matplotlib.pyplot, seaborn, geopandas, basemap and plotly.",
         "generate_code_r_lib_instruction": \
             "Install and load all required package at the beginning of the script (add install.packages/libraries).",
+        "generate_code_column_mapping_instruction": \
+            "- Column names: The column names in the file differ from the cleaned names. Load the file with the original "
+            "column names and rename the columns directly after loading with the following mapping "
+            "(original name -> cleaned name): `{column_mapping}`",
+        "generate_code_parquet_instruction": \
+            "- Format: The file is a parquet file, separator and encoding do not apply. Load it with "
+            "`pandas.read_parquet` (Python) or `arrow::read_parquet` (R).",
+        "generate_code_sheet_instruction": \
+            "- Sheet: Load the sheet `{sheet}` of the Excel file, separator and encoding do not apply.",
         "generate_code_description_user_prompt": \
             """
                 You receive a summary of the dataset, an explanation of all column, and the visualization goal to be implemented.
@@ -164,6 +188,8 @@ prompt: Prompt = Prompt(
                 - File path: `'{dataset_path}'`
                 - Separator: `'{dataset_sep}'`
                 - Encoding: `'{dataset_encoding}'`
+                {column_mapping_instruction}
+                {dataset_format_instruction}
 
                 Specifications for the code:
                 - The code should be directly executable without syntax error.
@@ -194,6 +220,8 @@ prompt: Prompt = Prompt(
                 - File path: `'{dataset_path}'`
                 - Separator: `'{dataset_sep}'`
                 - Encoding: `'{dataset_encoding}'`
+                {column_mapping_instruction}
+                {dataset_format_instruction}
 
                 Specifications for the code:
                 - The code should be directly executable without syntax error.
@@ -216,6 +244,7 @@ prompt: Prompt = Prompt(
                 '{df_head_markdown}'
             """,
     },
+    name="code_generation",
 )
 
 Goal = import_language_dto(AGENT_LANGUAGE, GoalBase)
@@ -227,17 +256,20 @@ def llm_generate_python_code(state: AgentState) -> AgentState:
     """Generates Python code for data visualization."""
     archive_images(state["output_path"], state["regeneration_attempts"])
     clear_output_dir(state["output_path"])
+    context = _pack_code_context(state, "llm_generate_python_code")
     for index, vis in enumerate(state["visualizations"]):
         vis: VisualizationWrapper
-        description_user_message, temp_agent = _get_generate_code_agent(state, vis.goal)
+        description_user_message, temp_agent = _get_generate_code_agent(state, vis.goal, context["summary"])
 
         code_user_message = prompt.get_prompt(
             AGENT_LANGUAGE,
             "generate_python_code",
-            dataset_path=state["dataset_path"],
+            dataset_path=state.get("dataset_code_path", state["dataset_path"]),
             dataset_sep=state["dataset_delimiter"],
             dataset_encoding=state["dataset_encoding"],
-            df_head_markdown=str(state["dataset_df"].head(10).to_markdown()),
+            column_mapping_instruction=_get_column_mapping_instruction(state),
+            dataset_format_instruction=_get_dataset_format_instruction(state),
+            df_head_markdown=context["df_head"],
             output_path=state["output_path"],
             goal_index=index
         )
@@ -268,7 +300,15 @@ def llm_generate_python_code(state: AgentState) -> AgentState:
     return state
 
 
-def _get_generate_code_agent(state: AgentState, goal: Goal):
+def _pack_code_context(state: AgentState, node: str) -> dict[str, str]:
+    """Helper-function to pack the summary and the head of the dataset, which are the same for all visualizations."""
+    return pack_context(node, {
+        "summary": partial(pack_text, str(getattr(state.get("summary", None), "summary", ""))),
+        "df_head": partial(pack_preview, state["dataset"].head(10)),
+    })
+
+
+def _get_generate_code_agent(state: AgentState, goal: Goal, summary: str):
     """Helper-function to create the code generation agent and description message."""
     programming_language = state["programming_language"]
 
@@ -289,8 +329,8 @@ def _get_generate_code_agent(state: AgentState, goal: Goal):
     )
 
     # create the agent
-    temp_agent = create_agent(
-        model=get_llm_model(LLMModel.GROK),
+    temp_agent = get_agent(
+        model=LLMModel.GROK,
         response_format=Code,
         system_prompt=system_prompt
     )
@@ -299,7 +339,7 @@ def _get_generate_code_agent(state: AgentState, goal: Goal):
     description_user_message = prompt.get_prompt(
         AGENT_LANGUAGE,
         "generate_code_description_user_prompt",
-        summary=str(getattr(state.get("summary", None), "summary", "")),
+        summary=summary,
         visualization_goal=goal
     )
     description_user_message = HumanMessage(content=description_user_message)
@@ -312,17 +352,20 @@ def llm_generate_r_code(state: AgentState) -> AgentState:
     """Generates R code for data visualization."""
     archive_images(state["output_path"], state["regeneration_attempts"])
     clear_output_dir(state["output_path"])
+    context = _pack_code_context(state, "llm_generate_r_code")
     for index, vis in enumerate(state["visualizations"]):
         vis: VisualizationWrapper
-        description_user_message, temp_agent = _get_generate_code_agent(state, vis.goal)
+        description_user_message, temp_agent = _get_generate_code_agent(state, vis.goal, context["summary"])
 
         code_user_message = prompt.get_prompt(
             AGENT_LANGUAGE,
             "generate_r_code",
-            dataset_path=state["dataset_path"],
+            dataset_path=state.get("dataset_code_path", state["dataset_path"]),
             dataset_sep=state["dataset_delimiter"],
             dataset_encoding=state["dataset_encoding"],
-            df_head_markdown=str(state["dataset_df"].head(10).to_markdown()),
+            column_mapping_instruction=_get_column_mapping_instruction(state),
+            dataset_format_instruction=_get_dataset_format_instruction(state),
+            df_head_markdown=context["df_head"],
             output_path=state["output_path"],
             goal_index=index
         )
@@ -352,6 +395,24 @@ def llm_generate_r_code(state: AgentState) -> AgentState:
     return state
 
 
+def _get_column_mapping_instruction(state: AgentState) -> str:
+    """Helper-function to tell the generated code how to rename the columns, if the loading cleaned any names."""
+    column_mapping = state.get("dataset_column_mapping")
+    if not column_mapping:
+        return ""
+    return prompt.get_prompt(AGENT_LANGUAGE, "generate_code_column_mapping_instruction", column_mapping=column_mapping)
+
+
+def _get_dataset_format_instruction(state: AgentState) -> str:
+    """Helper-function to tell the generated code how to read datasets, which are no csv files."""
+    dataset_code_path = state.get("dataset_code_path", state["dataset_path"])
+    if detect_format(dataset_code_path)[0] == "parquet":
+        return prompt.get_prompt(AGENT_LANGUAGE, "generate_code_parquet_instruction")
+    if detect_format(dataset_code_path)[0] in EXCEL_FORMATS:
+        return prompt.get_prompt(AGENT_LANGUAGE, "generate_code_sheet_instruction", sheet=state.get("dataset_sheet", 0))
+    return ""
+
+
 def decide_programming_language(state: AgentState):
     """Decides the programming language, which should be used for code generation."""
     programming_language: ProgrammingLanguage = state["programming_language"]
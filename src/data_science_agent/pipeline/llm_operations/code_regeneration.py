@@ -1,6 +1,5 @@
 import inspect
 
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
 from data_science_agent.dtos.base.responses.code_base import CodeBase
@@ -8,7 +7,7 @@ from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt, import_language_dto
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import get_llm_model, AGENT_LANGUAGE, print_color, MAX_REGENERATION_ATTEMPTS, LLMMetadata
+from data_science_agent.utils import get_agent, AGENT_LANGUAGE, print_color, MAX_REGENERATION_ATTEMPTS, LLMMetadata
 from data_science_agent.utils.enums import LLMModel, Color
 from data_science_agent.utils.pipeline import clear_output_dir, archive_images
 
@@ -54,7 +53,8 @@ prompt = Prompt(
                 This is the visualization goal to be implemented with the code:
                 '{visualization_goal}'
             """,
-    }
+    },
+    name="code_regeneration",
 )
 
 Code = import_language_dto(AGENT_LANGUAGE, CodeBase)
@@ -103,8 +103,8 @@ def llm_regenerate_code(state: AgentState) -> AgentState:
                 )
             ]
 
-            temp_agent = create_agent(
-                model=get_llm_model(LLMModel.GEMINI),
+            temp_agent = get_agent(
+                model=LLMModel.GEMINI,
                 response_format=Code
             )
 
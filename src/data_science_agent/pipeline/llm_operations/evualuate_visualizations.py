@@ -4,7 +4,6 @@ import os
 
 import numpy as np
 import pandas as pd
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
 from data_science_agent.dtos.base import LidaEvaluationBase
@@ -13,7 +12,7 @@ from data_science_agent.dtos.wrapper.SEVQ import SEVQ
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt, import_language_dto
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE, get_llm_model, print_color, LLMMetadata
+from data_science_agent.utils import AGENT_LANGUAGE, get_agent, print_color, LLMMetadata
 from data_science_agent.utils.enums import LLMModel, Color
 from data_science_agent.utils import icc_agreement
 
@@ -124,6 +123,7 @@ prompt = Prompt(
             Provide a rating (1–10) with clear justification for each dimension and conclude with a brief overall assessment.
             """
     },
+    name="evualuate_visualizations",
 )
 
 LidaEvaluation = import_language_dto(AGENT_LANGUAGE, LidaEvaluationBase)
@@ -188,8 +188,8 @@ def llm_evaluate_visualizations(state: AgentState) -> AgentState:
 
 def _get_SEVQ(i, programming_language: str, system_prompt: str, vis: VisualizationWrapper, state: AgentState,
               model: LLMModel):
-    temp_agent = create_agent(
-        model=get_llm_model(model),
+    temp_agent = get_agent(
+        model=model,
         system_prompt=SystemMessage(content=system_prompt),
         response_format=LidaEvaluation
     )
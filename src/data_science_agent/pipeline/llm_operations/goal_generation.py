@@ -1,6 +1,6 @@
 import inspect
+from functools import partial
 
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, AIMessage
 
 from data_science_agent.dtos.base.responses.goal_container_base import GoalContainerBase
@@ -8,8 +8,9 @@ from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt
 from data_science_agent.language import import_language_dto
+from data_science_agent.pipeline.context_packing import pack_context, pack_text
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE, get_llm_model, print_color
+from data_science_agent.utils import AGENT_LANGUAGE, get_agent, print_color
 from data_science_agent.utils.enums import LLMModel, Color
 from data_science_agent.utils.llm_metadata import LLMMetadata
 
@@ -61,6 +62,7 @@ prompt: Prompt = Prompt(
                 {summary}
             """
     },
+    name="goal_generation",
 )
 
 GoalContainer = import_language_dto(AGENT_LANGUAGE, GoalContainerBase)
@@ -79,16 +81,17 @@ def llm_generate_goals(state: AgentState) -> AgentState:
         "system_prompt",
     )
 
+    context = pack_context("llm_generate_goals", {"summary": partial(pack_text, str(state["summary"]))})
     user_prompt = prompt.get_prompt(
         AGENT_LANGUAGE,
         "user_prompt",
         n=state["number_visualization_goals"],
-        summary=state["summary"]
+        summary=context["summary"]
     )
     user_msg = HumanMessage(content=user_prompt)
 
-    temp_agent = create_agent(
-        model=get_llm_model(LLMModel.GEMINI),
+    temp_agent = get_agent(
+        model=LLMModel.GEMINI,
         response_format=GoalContainer,
         system_prompt=system_prompt
     )
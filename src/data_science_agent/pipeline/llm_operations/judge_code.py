@@ -1,6 +1,5 @@
 import inspect
 
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
 from data_science_agent.dtos.base.responses.judge_base import JudgeBase
@@ -9,7 +8,7 @@ from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt, import_language_dto
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE, get_llm_model, print_color, LLMMetadata
+from data_science_agent.utils import AGENT_LANGUAGE, get_agent, print_color, LLMMetadata
 from data_science_agent.utils.enums import LLMModel, Color
 
 prompt: Prompt = Prompt(
@@ -53,6 +52,7 @@ prompt: Prompt = Prompt(
                 {code}
             """
     },
+    name="judge_code",
 )
 
 JudgeVerdict = import_language_dto(AGENT_LANGUAGE, JudgeVerdictBase)
@@ -67,8 +67,8 @@ def llm_judge_code(state: AgentState) -> AgentState:
     for i, vis in enumerate(state["visualizations"]):
         vis: VisualizationWrapper
 
-        temp_agent = create_agent(
-            model=get_llm_model(LLMModel.GEMINI),
+        temp_agent = get_agent(
+            model=LLMModel.GEMINI,
             system_prompt=SystemMessage(content=system_prompt),
             response_format=JudgeVerdict
         )
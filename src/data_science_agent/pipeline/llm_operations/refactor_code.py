@@ -1,12 +1,11 @@
 import inspect
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from data_science_agent.dtos.base.responses.code_base import CodeBase
 from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt, import_language_dto
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE, get_llm_model, LLMMetadata
+from data_science_agent.utils import AGENT_LANGUAGE, get_agent, LLMMetadata
 from data_science_agent.utils.enums import LLMModel, Color
 
 prompt: Prompt = Prompt(
@@ -52,6 +51,7 @@ prompt: Prompt = Prompt(
             and return the completely revised source code.
         """
     },
+    name="refactor_code",
 )
 
 Code = import_language_dto(AGENT_LANGUAGE, CodeBase)
@@ -63,8 +63,8 @@ def llm_refactor_visualizations(state: AgentState) -> AgentState:
 
     system_prompt = prompt.get_prompt(AGENT_LANGUAGE, "refactor_system_prompt")
 
-    base_agent = create_agent(
-        model=get_llm_model(LLMModel.MISTRAL),
+    base_agent = get_agent(
+        model=LLMModel.MISTRAL,
         system_prompt=SystemMessage(content=system_prompt),
         response_format=Code,
     )
@@ -1,29 +1,24 @@
 import csv
 import inspect
 import os
+from functools import partial
 from typing import Any
 
-import nltk
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, AIMessage
-from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
-from nltk.translate.meteor_score import meteor_score
-from nltk.tokenize import word_tokenize
 from pydantic import BaseModel
-from rouge_score import rouge_scorer
 
 from data_science_agent.dtos.base.responses.summary_base import SummaryBase
 from data_science_agent.dtos.wrapper import VisualizationWrapper
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt
 from data_science_agent.language import import_language_dto
+from data_science_agent.pipeline.context_packing import pack_context, pack_descriptions, pack_preview
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE, get_llm_model, print_color, DurationMetadata, LLMMetadata
+from data_science_agent.pipeline.nltk_resources import ensure_nltk_resources
+from data_science_agent.utils import AGENT_LANGUAGE, get_agent, print_color, DatasetHandle, DurationMetadata, LLMMetadata
 from data_science_agent.utils.enums import LLMModel, Color, ProgrammingLanguage
 from data_science_agent.utils.llm_metadata import LLMMetadata
 
-nltk.download('wordnet')
-
 prompt: Prompt = Prompt(
     de={
         "summary_system_prompt": \
@@ -70,7 +65,8 @@ prompt: Prompt = Prompt(
                 The language used should be English.
                 For me, visualizations are especially important that help me understand and analyze the dataset.
             """
-    }
+    },
+    name="summary_generation",
 )
 
 Summary = import_language_dto(AGENT_LANGUAGE, SummaryBase)
@@ -80,11 +76,14 @@ Summary = import_language_dto(AGENT_LANGUAGE, SummaryBase)
 def llm_generate_summary(state: AgentState) -> AgentState:
     """This node generates the dataset summary by using a LLM."""
 
-    gpt5   = _get_agent_and_messages(state, LLMModel.GPT_5)
-    gpt4o  = _get_agent_and_messages(state, LLMModel.GPT_4o)
-    gemini = _get_agent_and_messages(state, LLMModel.GEMINI)
-    grok   = _get_agent_and_messages(state, LLMModel.GROK)
-    claude4= _get_agent_and_messages(state, LLMModel.CLAUDE_4)
+    # der System-Prompt ist für alle Modelle gleich und wird nur einmal gepackt
+    system_prompt = _get_system_prompt(state)
+
+    gpt5   = _get_agent_and_messages(system_prompt, LLMModel.GPT_5)
+    gpt4o  = _get_agent_and_messages(system_prompt, LLMModel.GPT_4o)
+    gemini = _get_agent_and_messages(system_prompt, LLMModel.GEMINI)
+    grok   = _get_agent_and_messages(system_prompt, LLMModel.GROK)
+    claude4= _get_agent_and_messages(system_prompt, LLMModel.CLAUDE_4)
 
     results = []
     for model_name, response in [
@@ -114,9 +113,10 @@ def llm_generate_summary(state: AgentState) -> AgentState:
     llm_response = gemini
     for message in reversed(llm_response["messages"]):
         if isinstance(message, AIMessage):
-            state["llm_metadata"].append(
-                LLMMetadata.from_ai_message(message, inspect.currentframe().f_code.co_name)
-            )
+            llm_metadata = LLMMetadata.from_ai_message(message, inspect.currentframe().f_code.co_name)
+            if state.get("metadata_condensed") is not None:
+                llm_metadata.prompt_tokens_saved = state["metadata_condensed"].get_saved_tokens()
+            state["llm_metadata"].append(llm_metadata)
             break
 
     summary: Summary = llm_response["structured_response"]
@@ -134,8 +134,8 @@ def llm_generate_summary(state: AgentState) -> AgentState:
 
 
 def evaluate_summary_by_model(state: AgentState, summary: BaseModel, model_name:str) -> dict[str, float]:
-    dataset_text = get_dataset_preview(state.get("dataset_df", []), 25).to_markdown()
-    metadata_text = str(state.get("metadata", ""))
+    dataset_text = get_dataset_preview(state.get("dataset"), 25).to_markdown()
+    metadata_text = get_metadata_text(state)
     descriptions_text = str(state.get("descriptions", ""))
     evaluation_scores = evaluate_summary(
         summary=summary,
@@ -148,24 +148,31 @@ def evaluate_summary_by_model(state: AgentState, summary: BaseModel, model_name:
     return evaluation_scores
 
 
-def _get_agent_and_messages(state: AgentState, model: LLMModel) -> dict[str, Any] | Any:
-    system_prompt = prompt.get_prompt(
+def _get_system_prompt(state: AgentState) -> str:
+    """Helper-function to render the system prompt, the descriptions and the preview are packed to the token budget."""
+    context = pack_context("llm_generate_summary", {
+        "descriptions": partial(pack_descriptions, state.get("descriptions", [])),
+        "dataset": partial(pack_preview, get_dataset_preview(state["dataset"])),
+    })
+    return prompt.get_prompt(
         AGENT_LANGUAGE,
         "summary_system_prompt",
         column_names=str(state.get("column_names", [])),
-        descriptions=str(state.get("descriptions", [])),
-        metadata=str(state.get("metadata", [])),
-        dataset=str(get_dataset_preview(state["dataset_df"]).to_markdown())
+        descriptions=context["descriptions"],
+        metadata=get_metadata_text(state),
+        dataset=context["dataset"]
     )
 
+
+def _get_agent_and_messages(system_prompt: str, model: LLMModel) -> dict[str, Any] | Any:
     user_content = prompt.get_prompt(
         AGENT_LANGUAGE,
         "summary_user_prompt"
     )
     user_msg = HumanMessage(content=user_content)
 
-    temp_agent = create_agent(
-        model=get_llm_model(model),
+    temp_agent = get_agent(
+        model=model,
         response_format=Summary,
         system_prompt=system_prompt
     )
@@ -174,14 +181,18 @@ def _get_agent_and_messages(state: AgentState, model: LLMModel) -> dict[str, Any
     return llm_response
 
 
-def get_dataset_preview(df, n=25):
-    """Robust sampling."""
-    if df is None:
+def get_metadata_text(state: AgentState) -> str:
+    """Returns the metadata of the prompts, the condensed metadata if a token budget is set."""
+    if state.get("metadata_condensed") is not None:
+        return state["metadata_condensed"].text
+    return str(state.get("metadata", []))
+
+
+def get_dataset_preview(dataset: DatasetHandle, n=25):
+    """Robust sampling, the sample of the default size is cached in the dataset handle."""
+    if dataset is None:
         return None
-    sample_size = min(n, len(df))
-    if sample_size == 0:
-        return df
-    return df.sample(n=sample_size, random_state=42, replace=False)
+    return dataset.sample(n)
 
 
 def evaluate_summary(summary: Summary, dataset_text: str, metadata: str, column_descriptions: str) -> dict[str, float]:
@@ -189,6 +200,13 @@ def evaluate_summary(summary: Summary, dataset_text: str, metadata: str, column_
     Evaluates the generated summary using ROUGE, BLEU and METEOR against a reference text constructed from the dataset,
     metadata and column descriptions.
     """
+    # the evaluation dependencies are imported, when the first summary is evaluated, and not with the pipeline
+    from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
+    from nltk.translate.meteor_score import meteor_score
+    from nltk.tokenize import word_tokenize
+    from rouge_score import rouge_scorer
+
+    ensure_nltk_resources()
 
     reference_text = f"{column_descriptions}\n{metadata}\n{dataset_text}"
     summary_text = f"{summary.summary}\n{summary.columns}"
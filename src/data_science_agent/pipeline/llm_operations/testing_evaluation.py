@@ -1,13 +1,13 @@
 import inspect
 
-from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, AIMessage
 
 from data_science_agent.dtos.base.responses.regeneration_base import RegenerationBase
 from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.graph import AgentState
 from data_science_agent.language import Prompt, import_language_dto
-from data_science_agent.utils import get_llm_model, AGENT_LANGUAGE, print_color, MAX_REGENERATION_ATTEMPTS, LLMMetadata
+from data_science_agent.pipeline.decorator.llm_cache_scope import llm_cache_scope
+from data_science_agent.utils import get_agent, AGENT_LANGUAGE, print_color, MAX_REGENERATION_ATTEMPTS, LLMMetadata
 from data_science_agent.utils.enums import LLMModel, Color
 
 prompt = Prompt(
@@ -51,13 +51,14 @@ prompt = Prompt(
                 Please decide whether the code absolutely needs to be regenerated.
             """,
     },
+    name="testing_evaluation",
 )
 
 Regeneration = import_language_dto(AGENT_LANGUAGE, RegenerationBase)
 
+@llm_cache_scope
 def decide_regenerate_code(state: AgentState) -> AgentState:
     """Decides whether the code should be regenerated based on test results for each visualization."""
-    model = get_llm_model(LLMModel.GPT_4o)
     any_needs_regeneration = False
 
     for i, vis in enumerate(state["visualizations"]):
@@ -76,8 +77,8 @@ def decide_regenerate_code(state: AgentState) -> AgentState:
                 )
             )
 
-            decide_agent = create_agent(
-                model=model,
+            decide_agent = get_agent(
+                model=LLMModel.GPT_4o,
                 response_format=Regeneration,
                 system_prompt=prompt.get_prompt(AGENT_LANGUAGE, "decide_regenerate_code_system_prompt")
             )
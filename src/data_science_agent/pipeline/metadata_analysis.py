@@ -1,10 +1,12 @@
-from rdflib.graph import Graph, Namespace
-
 from data_science_agent.dtos.base import MetadataBase
 from data_science_agent.graph import AgentState
 from data_science_agent.language import import_language_dto
 from data_science_agent.pipeline.decorator.duration_tracking import track_duration
-from data_science_agent.utils import AGENT_LANGUAGE
+from data_science_agent.pipeline.metadata_cache import load_or_parse_metadata
+from data_science_agent.pipeline.metadata_condensation import condense_metadata
+from data_science_agent.pipeline.rdf_parsing import Namespace
+from data_science_agent.utils import AGENT_LANGUAGE, METADATA_TOKEN_BUDGET, TripleStore, print_color
+from data_science_agent.utils.enums import Color
 
 Metadata = import_language_dto(AGENT_LANGUAGE, base_dto_class=MetadataBase)
 
@@ -117,15 +119,18 @@ excluded_predicates_uris.add("http://purl.org/dc/terms/format")
 def analyse_metadata(state: AgentState) -> AgentState:
     """
     Parse and analyse RDF metadata, excluding uninformative/technical predicates.
-    Stores the remaining triples (as Metadata objects) in state['metadata'].
+    Stores the remaining triples (as compact store of Metadata objects) in state['metadata'].
+    The filtered triples are cached per file content, so repeated runs do not parse the file again.
     """
-    g = Graph()
-    g.parse(state["metadata_path"], format="xml")
-
-    metadata = []
-    for s, p, o in g.triples((None, None, None)):
-        if str(p) not in excluded_predicates_uris:
-            metadata.append(Metadata(subject=str(s), predicate=str(p), object=str(o)))
-
-    state["metadata"] = metadata
+    triples = load_or_parse_metadata(state["metadata_path"], excluded_predicates_uris)
+    state["metadata"] = TripleStore(triples, Metadata)
+
+    if METADATA_TOKEN_BUDGET > 0:
+        condensed = condense_metadata(state["metadata"], METADATA_TOKEN_BUDGET)
+        state["metadata_condensed"] = condensed
+        print_color(
+            f"Metadata condensed from {condensed.original_tokens} to {condensed.condensed_tokens} tokens "
+            f"({condensed.selected_triples} of {condensed.original_triples} triples).",
+            Color.OK_BLUE
+        )
     return state
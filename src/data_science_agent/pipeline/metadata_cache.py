@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+from typing import AbstractSet, Optional
+
+from data_science_agent.pipeline.rdf_parsing import Triple, parse_rdf_triples
+from data_science_agent.utils import DATASET_CACHE_DIR, METADATA_CACHE_MAX_MB, print_color
+from data_science_agent.utils.cache import atomic_write_bytes, evict_lru, file_digest, touch
+from data_science_agent.utils.enums import Color
+
+# bump this version, whenever the parsing of the metadata changes, so outdated entries are not used anymore
+METADATA_CACHE_VERSION = 1
+METADATA_CACHE_DIR = os.path.join(DATASET_CACHE_DIR, "metadata")
+METADATA_SUFFIX = ".json"
+
+
+def is_metadata_cache_enabled() -> bool:
+    """Returns whether the parsed metadata cache is enabled."""
+    return METADATA_CACHE_MAX_MB > 0
+
+
+def metadata_cache_key(file_location: str, excluded_predicates: AbstractSet[str] = frozenset()) -> str:
+    """
+    Returns the cache key of a metadata file, which is based on the file content and the excluded predicates. Changing
+    the excluded predicates therefore invalidates the cached triples.
+    """
+    predicates_digest = hashlib.sha256("\n".join(sorted(excluded_predicates)).encode("utf-8")).hexdigest()[:16]
+    return f"v{METADATA_CACHE_VERSION}-{file_digest(file_location)}-{predicates_digest}"
+
+
+def load_or_parse_metadata(file_location: str, excluded_predicates: AbstractSet[str] = frozenset()) -> list[Triple]:
+    """
+    Loads the triples of an RDF/XML metadata file from the cache or parses and caches them, if they are not cached
+    yet. Only the triples without excluded predicates are cached.
+
+    :param file_location: The path to the RDF/XML file.
+    :param excluded_predicates: The URIs of the predicates to drop.
+    :return: The (subject, predicate, object) triples.
+    """
+    if not is_metadata_cache_enabled():
+        return parse_rdf_triples(file_location, excluded_predicates)
+
+    key = metadata_cache_key(file_location, excluded_predicates)
+    triples = _load_cached_metadata(key)
+    if triples is None:
+        triples = parse_rdf_triples(file_location, excluded_predicates)
+        _store_cached_metadata(key, triples)
+    return triples
+
+
+def prepare_shared_metadata(file_location: str, excluded_predicates: AbstractSet[str] = frozenset()) -> None:
+    """
+    Parses a metadata file into the cache, before several worker processes load it, so the file is parsed once and
+    not by every worker, which starts before the first one finished.
+
+    :param file_location: The path to the RDF/XML file.
+    :param excluded_predicates: The URIs of the predicates to drop, like in the node using the metadata.
+    """
+    if not is_metadata_cache_enabled() or not os.path.exists(file_location):
+        return
+    try:
+        load_or_parse_metadata(file_location, excluded_predicates)
+    except Exception as e:
+        # the workers fail with the same error and report it for their run
+        print_color(f"Could not prepare metadata {file_location}: {e}", Color.WARNING)
+
+
+def _load_cached_metadata(key: str) -> Optional[list[Triple]]:
+    """Loads the cached triples or returns None, if there is no entry for the key."""
+    path = os.path.join(METADATA_CACHE_DIR, key + METADATA_SUFFIX)
+    try:
+        with open(path, encoding="utf-8") as f:
+            triples = [tuple(triple) for triple in json.load(f)]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print_color(f"Could not read cached metadata {key}: {e}", Color.WARNING)
+        return None
+    touch(path)
+    return triples
+
+
+def _store_cached_metadata(key: str, triples: list[Triple]) -> None:
+    """Stores the triples as compact json array and evicts the least recently used entries."""
+    data = json.dumps(triples, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    atomic_write_bytes(os.path.join(METADATA_CACHE_DIR, key + METADATA_SUFFIX), data)
+    evict_lru(METADATA_CACHE_DIR, METADATA_CACHE_MAX_MB * 1024 * 1024, METADATA_SUFFIX)
@@ -0,0 +1,134 @@
+import re
+
+from data_science_agent.utils import CondensedMetadata, TripleStore
+from data_science_agent.utils.tokens import count_tokens
+
+# prefixes of the vocabularies used by DCAT-AP(.de), shortened predicates save tokens without losing information
+PREFIXES = {
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#": "rdf:",
+    "http://www.w3.org/2000/01/rdf-schema#": "rdfs:",
+    "http://purl.org/dc/terms/": "dct:",
+    "http://www.w3.org/ns/dcat#": "dcat:",
+    "http://dcat-ap.de/def/dcatde/": "dcatde:",
+    "http://www.w3.org/ns/adms#": "adms:",
+    "http://spdx.org/rdf/terms#": "spdx:",
+    "http://www.w3.org/2006/vcard/ns#": "vcard:",
+    "http://xmlns.com/foaf/0.1/": "foaf:",
+    "http://www.w3.org/2004/02/skos/core#": "skos:",
+    "http://www.w3.org/ns/locn#": "locn:",
+    "http://www.w3.org/2002/07/owl#": "owl:",
+    "http://schema.org/": "schema:",
+}
+# predicates ordered by how much they tell about the content of a dataset, all other predicates follow
+PREDICATE_RANKING = [
+    "dct:title",
+    "dct:description",
+    "dcat:keyword",
+    "dct:subject",
+    "dct:temporal",
+    "dcat:startDate",
+    "dcat:endDate",
+    "schema:startDate",
+    "schema:endDate",
+    "dct:accrualPeriodicity",
+    "dct:publisher",
+    "dcat:landingPage",
+    "rdfs:comment",
+    "skos:note",
+]
+# longer literals (e.g. descriptions with change logs) are truncated
+MAX_LITERAL_CHARS = 500
+# blank node ids of the RDF parser, they are renamed to short ids
+BLANK_NODE = re.compile(r"N[0-9a-f]{32}")
+URI = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:\S*$")
+
+
+def condense_metadata(metadata: TripleStore, token_budget: int) -> CondensedMetadata:
+    """
+    Condenses the metadata triples for the prompts: duplicates are removed, long literals truncated, predicates
+    shortened with the common prefixes and the triples grouped by subject. If the triples still exceed the token
+    budget, the most informative triples (see `PREDICATE_RANKING`) are selected until the budget is used up.
+
+    :param metadata: The metadata triples.
+    :param token_budget: The maximum number of tokens of the condensed metadata.
+    :return: The condensed metadata and its token counts.
+    """
+    triples = list(dict.fromkeys(
+        (subject, _shorten(predicate), _condense_object(obj)) for subject, predicate, obj in metadata.iter_triples()
+    ))
+    blank_nodes: dict[str, str] = {}
+
+    def term(value: str) -> str:
+        if BLANK_NODE.fullmatch(value):
+            return blank_nodes.setdefault(value, f"_:b{len(blank_nodes) + 1}")
+        return value
+
+    # the blank nodes are numbered in document order
+    for subject, _, obj in triples:
+        term(subject)
+        term(obj)
+
+    # the dataset itself is described first, then its distributions, publishers etc.
+    datasets = {subject for subject, predicate, obj in triples if predicate == "rdf:type" and obj == "dcat:Dataset"}
+    # the costs are estimated per line, the subject line is paid by the first selected triple of the subject
+    positions = sorted(range(len(triples)), key=lambda position: _rank(triples[position], position, datasets))
+    selected, seen_subjects, used_tokens = set(), set(), 0
+    for position in positions:
+        subject, predicate, obj = triples[position]
+        cost = count_tokens(f"  {predicate}: {term(obj)}\n")
+        if subject not in seen_subjects:
+            cost += count_tokens(f"{term(subject)}\n")
+        if used_tokens + cost > token_budget:
+            continue
+        selected.add(position)
+        seen_subjects.add(subject)
+        used_tokens += cost
+
+    text = _render([triple for position, triple in enumerate(triples) if position in selected], term)
+    return CondensedMetadata(
+        text=text,
+        original_tokens=count_tokens(str(metadata)),
+        condensed_tokens=count_tokens(text),
+        original_triples=len(metadata),
+        selected_triples=len(selected),
+    )
+
+
+def _render(triples: list[tuple[str, str, str]], term) -> str:
+    """Renders the triples grouped by subject and predicate in the order of their first occurrence."""
+    subjects: dict[str, dict[str, list[str]]] = {}
+    for subject, predicate, obj in triples:
+        subjects.setdefault(subject, {}).setdefault(predicate, []).append(term(obj))
+    lines = []
+    for subject, predicates in subjects.items():
+        lines.append(term(subject))
+        lines.extend(f"  {predicate}: {' | '.join(objects)}" for predicate, objects in predicates.items())
+    return "\n".join(lines)
+
+
+def _rank(triple: tuple[str, str, str], position: int, datasets: set[str]) -> tuple[bool, int, bool, int]:
+    """
+    Sort key of the triples, triples of the datasets first, then ranked predicates, literals before resources and
+    finally the document order.
+    """
+    subject, predicate, obj = triple
+    rank = PREDICATE_RANKING.index(predicate) if predicate in PREDICATE_RANKING else len(PREDICATE_RANKING)
+    return subject not in datasets, rank, URI.match(obj) is not None, position
+
+
+def _shorten(uri: str) -> str:
+    """Shortens a URI with the prefix of its vocabulary."""
+    for namespace, prefix in PREFIXES.items():
+        if uri.startswith(namespace):
+            return prefix + uri[len(namespace):]
+    return uri
+
+
+def _condense_object(obj: str) -> str:
+    """Collapses the whitespace of literals and truncates long ones, resources are kept as they are."""
+    if URI.match(obj):
+        return _shorten(obj)
+    obj = " ".join(obj.split())
+    if len(obj) > MAX_LITERAL_CHARS:
+        obj = obj[:MAX_LITERAL_CHARS].rstrip() + " …"
+    return obj
@@ -0,0 +1,30 @@
+from functools import lru_cache
+
+from data_science_agent.utils import NLTK_DATA_DIR, print_color
+from data_science_agent.utils.enums import Color
+
+# resources of the summary evaluation (METEOR needs wordnet, `word_tokenize` the punkt tables) by their package
+NLTK_RESOURCES = {
+    "wordnet": "corpora/wordnet",
+    "punkt_tab": "tokenizers/punkt_tab",
+}
+
+
+@lru_cache(maxsize=1)
+def ensure_nltk_resources() -> None:
+    """
+    Makes the NLTK resources of the summary evaluation available from `NLTK_DATA_DIR`. Resources, which are missing
+    there (or in the other NLTK data paths), are downloaded into `NLTK_DATA_DIR` once, so later runs and worker
+    processes load them locally without network access.
+    """
+    import nltk
+
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    for package, resource in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            print_color(f"NLTK resource '{package}' not found, downloading it to {NLTK_DATA_DIR}.", Color.WARNING)
+            if not nltk.download(package, download_dir=NLTK_DATA_DIR, quiet=True):
+                print_color(f"Could not download NLTK resource '{package}'.", Color.WARNING)
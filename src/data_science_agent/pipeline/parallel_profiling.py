@@ -0,0 +1,47 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from data_science_agent.pipeline.profile_cache import load_or_profile_columns
+from data_science_agent.utils import DatasetHandle
+
+# batches per worker of in-memory datasets, smaller batches balance columns of different cost
+BATCHES_PER_WORKER = 4
+
+
+def profile_columns_parallel(dataset: DatasetHandle, workers: int) -> tuple[list[dict[str, Any]], int]:
+    """
+    Profiles the columns of a dataset with several workers, the profiles are merged back in column order.
+
+    Columns of in-memory datasets are profiled in batches by a thread pool, the DataFrame is shared and the sorting /
+    hashing of numpy and Arrow backed columns mostly runs without the GIL. Streamed datasets are profiled column by
+    column by a process pool, every process loads only its column through the (picklable) dataset handle. The
+    workers reuse cached profiles of unchanged columns (see `load_or_profile_columns`).
+
+    :param dataset: The handle of the dataset.
+    :param workers: The number of threads or processes.
+    :return: One dictionary per column like `profile_columns` and the number of profiles loaded from the cache.
+    """
+    if dataset.streamed:
+        executor: Executor = ProcessPoolExecutor(max_workers=workers)
+        tasks = [(dataset, [column]) for column in dataset.columns]
+        profile = _profile_loaded_columns
+    else:
+        df = dataset.to_pandas()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        batches = np.array_split(np.arange(df.shape[1]), min(df.shape[1], workers * BATCHES_PER_WORKER))
+        # batches of positions, so duplicate column names are profiled like by `profile_columns(df)`
+        tasks = [(df.iloc[:, batch],) for batch in batches]
+        profile = load_or_profile_columns
+
+    with executor:
+        # map returns the results in the order of the tasks
+        results = list(executor.map(profile, *zip(*tasks)))
+    profiles = [column_profile for batch_profiles, _ in results for column_profile in batch_profiles]
+    return profiles, sum(cache_hits for _, cache_hits in results)
+
+
+def _profile_loaded_columns(dataset: DatasetHandle, columns: list[str]) -> tuple[list[dict[str, Any]], int]:
+    """Loads and profiles the given columns of a dataset in a worker process."""
+    return load_or_profile_columns(dataset.get_columns(columns))
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from data_science_agent.pipeline.column_profiler import profile_columns
+from data_science_agent.utils import DATASET_CACHE_DIR, DATASET_PROFILE_CACHE_MAX_MB, print_color
+from data_science_agent.utils.cache import atomic_write_bytes, evict_lru, touch
+from data_science_agent.utils.enums import Color
+
+# bump this version, whenever the column profiles change, so outdated profiles are not used anymore
+PROFILE_CACHE_VERSION = 2
+PROFILE_CACHE_DIR = os.path.join(DATASET_CACHE_DIR, "profiles")
+PROFILE_SUFFIX = ".json"
+
+
+def is_profile_cache_enabled() -> bool:
+    """Returns whether the column profile cache is enabled."""
+    return DATASET_PROFILE_CACHE_MAX_MB > 0
+
+
+def load_or_profile_columns(df: DataFrame) -> tuple[list[dict[str, Any]], int]:
+    """
+    Profiles the columns of a DataFrame like `profile_columns`, but reuses the cached profiles of columns with the
+    same content. Only new or changed columns are profiled and added to the cache, e.g. for a new snapshot of a
+    dataset, in which most columns did not change.
+
+    :param df: The DataFrame to profile.
+    :return: One dictionary per column in the order of the columns and the number of profiles loaded from the cache.
+    """
+    if not is_profile_cache_enabled():
+        return profile_columns(df), 0
+
+    keys = [column_content_key(df.iloc[:, position]) for position in range(df.shape[1])]
+    profiles = [_load_profile(key) for key in keys]
+    missing = [position for position, profile in enumerate(profiles) if profile is None]
+    if missing:
+        for position, profile in zip(missing, profile_columns(df.iloc[:, missing])):
+            profiles[position] = profile
+            _store_profile(keys[position], profile)
+
+    # the same content may be cached under another column name
+    profiles = [{**profile, "column_name": str(name)} for name, profile in zip(df.columns, profiles)]
+    return profiles, len(keys) - len(missing)
+
+
+def column_content_key(column: Series) -> str:
+    """
+    Returns the cache key of a column, which is based on its values and the kind of its dtype. The key does not
+    depend on the column name or on the string dtype (object, python or arrow backed), which profile the same way.
+    Categorical columns have keys of their own, their top value is chosen by the order of the categories.
+    """
+    dtype = column.dtype
+    # sha1 is hardware accelerated on most cpus, the key only has to tell column contents apart
+    digest = hashlib.sha1(usedforsecurity=False)
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufmM":
+        # the raw values are hashed directly, their meaning depends on the exact dtype
+        digest.update(f"v{PROFILE_CACHE_VERSION}-{_dtype_kind(dtype)}-raw-{dtype}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(column.to_numpy()).view(np.uint8))
+    else:
+        digest.update(f"v{PROFILE_CACHE_VERSION}-{_dtype_kind(dtype)}-hashed".encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().view(np.uint8))
+    if isinstance(dtype, pd.CategoricalDtype):
+        categories = dtype.categories.to_series()
+        digest.update(pd.util.hash_pandas_object(categories, index=False).to_numpy().view(np.uint8))
+    return digest.hexdigest()
+
+
+def evict_profile_cache() -> None:
+    """Evicts the least recently used profiles, if the cache exceeds its size limit."""
+    if is_profile_cache_enabled() and os.path.isdir(PROFILE_CACHE_DIR):
+        evict_lru(PROFILE_CACHE_DIR, DATASET_PROFILE_CACHE_MAX_MB * 1024 * 1024, PROFILE_SUFFIX)
+
+
+def _dtype_kind(dtype) -> str:
+    """Returns the kind of a dtype, which determines how a column is profiled (see `profile_columns`)."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+        # the unit and time zone are part of the profile
+        return str(dtype)
+    if isinstance(dtype, pd.CategoricalDtype):
+        # ties of the top value are broken by the order of the categories instead of the first occurrence
+        return "categorical"
+    return "other"
+
+
+def _load_profile(key: str) -> Optional[dict[str, Any]]:
+    """Loads a cached profile or returns None, if the column was not profiled yet."""
+    path = os.path.join(PROFILE_CACHE_DIR, key + PROFILE_SUFFIX)
+    try:
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print_color(f"Could not read cached column profile {key}: {e}", Color.WARNING)
+        return None
+    touch(path)
+    return profile
+
+
+def _store_profile(key: str, profile: dict[str, Any]) -> None:
+    """Stores a profile in the cache, profiles with values, which json does not restore as they are, are skipped."""
+    values = {name: value for name, value in profile.items() if name != "column_name"}
+    if not all(value is None or isinstance(value, (str, int, float)) for value in values.values()):
+        # e.g. a top value of a column with python objects
+        return
+    atomic_write_bytes(os.path.join(PROFILE_CACHE_DIR, key + PROFILE_SUFFIX), json.dumps(values).encode("utf-8"))
@@ -0,0 +1,309 @@
+import itertools
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AbstractSet, Iterator, Optional
+from urllib.parse import urljoin, urldefrag
+from xml.sax.saxutils import escape, quoteattr
+
+from data_science_agent.utils import print_color
+from data_science_agent.utils.enums import Color
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+RDF_TYPE = RDF_NS + "type"
+RDF_FIRST = RDF_NS + "first"
+RDF_REST = RDF_NS + "rest"
+RDF_NIL = RDF_NS + "nil"
+XML_BASE = f"{{{XML_NS}}}base"
+
+# rdf attributes, which are syntax and not properties of the node
+SYNTAX_ATTRIBUTES = {
+    f"{{{RDF_NS}}}{name}" for name in ("about", "ID", "nodeID", "resource", "datatype", "parseType", "aboutEach",
+                                       "aboutEachPrefix", "bagID")
+}
+
+Triple = tuple[str, str, str]
+
+
+class Namespace(str):
+    """Namespace of URIs like `rdflib.Namespace`, e.g. `DCAT.distribution` is the URI of the term as string."""
+
+    def __getattr__(self, name: str) -> str:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self + name
+
+
+@dataclass
+class _Frame:
+    """An open element of the document. Node frames describe a subject, property frames a predicate of it."""
+    is_node: bool
+    base: str
+    subject: Optional[str] = None
+    predicate: Optional[str] = None
+    parse_type: Optional[str] = None
+    has_object: bool = False  # property element with a resource or a nested node element
+    items: list[str] = field(default_factory=list)  # node elements of a rdf:parseType="Collection"
+    li_counter: int = 0
+    literal_depth: int = 0  # 1 + open child elements of a rdf:parseType="Literal" property
+    # prefixes by namespace URI in scope of the child elements of a rdf:parseType="Literal" property
+    literal_prefixes: dict[ET.Element, dict[str, str]] = field(default_factory=dict)
+
+
+def iter_rdf_triples(file_location: str, excluded_predicates: AbstractSet[str] = frozenset()) -> Iterator[Triple]:
+    """
+    Parses an RDF/XML file in one streaming pass and yields its triples as strings, like `str()` of the rdflib terms.
+    Triples with an excluded predicate are dropped while parsing, no graph is built and elements are released as
+    soon as they are processed, so the memory usage does not grow with the file size.
+
+    Blank nodes are numbered in document order (in the format of rdflib blank nodes), so parsing the same file twice
+    yields the same triples. Literals are yielded with their lexical form, language tags and datatypes are not part of
+    the string.
+
+    :param file_location: The path to the RDF/XML file.
+    :param excluded_predicates: The URIs of the predicates to drop.
+    :return: The (subject, predicate, object) triples in document order.
+    """
+    document_base = Path(file_location).absolute().as_uri()
+    blank_nodes = itertools.count()
+    node_ids: dict[str, str] = {}
+
+    def new_blank_node() -> str:
+        return f"N{next(blank_nodes):032x}"
+
+    def blank_node(node_id: str) -> str:
+        if node_id not in node_ids:
+            node_ids[node_id] = new_blank_node()
+        return node_ids[node_id]
+
+    def emit(subject: str, predicate: str, obj: str) -> Iterator[Triple]:
+        if predicate not in excluded_predicates:
+            yield subject, predicate, obj
+
+    stack: list[_Frame] = []
+    # prefixes by namespace URI of the open elements, the literal elements are serialized with them like in rdflib
+    prefixes: list[dict[str, str]] = [{XML_NS: "xml"}]
+    declared: dict[str, str] = {}
+    for event, element in ET.iterparse(file_location, events=("start-ns", "start", "end")):
+        if event == "start-ns":
+            # the declarations of an element precede its start
+            prefix, namespace = element
+            declared[namespace] = prefix
+            continue
+        if event == "start":
+            prefixes.append({**prefixes[-1], **declared} if declared else prefixes[-1])
+            declared = {}
+        else:
+            prefixes.pop()
+        parent = stack[-1] if stack else None
+
+        if parent is not None and parent.literal_depth and not (event == "end" and parent.literal_depth == 1):
+            # inside a rdf:parseType="Literal" the elements are kept and serialized when the property ends
+            parent.literal_depth += 1 if event == "start" else -1
+            if event == "start":
+                parent.literal_prefixes[element] = prefixes[-1]
+            continue
+
+        if event == "start":
+            base = _base(element, parent.base if parent else document_base)
+            if parent is None and element.tag == f"{{{RDF_NS}}}RDF":
+                stack.append(_Frame(is_node=False, base=base, has_object=True))
+            elif parent is None or not parent.is_node:
+                frame = _Frame(is_node=True, base=base, subject=_subject(element, base, new_blank_node, blank_node))
+                if parent is not None and parent.parse_type == "Collection":
+                    parent.items.append(frame.subject)
+                elif parent is not None and parent.predicate is not None:
+                    parent.has_object = True
+                    yield from emit(parent.subject, parent.predicate, frame.subject)
+                if element.tag != f"{{{RDF_NS}}}Description":
+                    yield from emit(frame.subject, RDF_TYPE, _uri(element.tag))
+                yield from _property_attributes(element, frame.subject, base, emit)
+                stack.append(frame)
+            else:
+                yield from _start_property(element, parent, base, new_blank_node, blank_node, emit, stack)
+            continue
+
+        frame = stack.pop()
+        if not frame.is_node and frame.predicate is not None:
+            yield from _end_property(element, frame, new_blank_node, emit)
+        # all triples of the element were yielded, so its attributes, text and children are released
+        element.clear()
+
+
+def parse_rdf_triples(file_location: str, excluded_predicates: AbstractSet[str] = frozenset()) -> list[Triple]:
+    """
+    Parses an RDF/XML file with the streaming parser (see `iter_rdf_triples`), rdflib is used if the streaming parser
+    fails.
+
+    :param file_location: The path to the RDF/XML file.
+    :param excluded_predicates: The URIs of the predicates to drop.
+    :return: The (subject, predicate, object) triples.
+    """
+    try:
+        return list(iter_rdf_triples(file_location, excluded_predicates))
+    except Exception as e:
+        print_color(f"Streaming RDF parser failed for {file_location}, using rdflib: {e}", Color.WARNING)
+
+    # rdflib is only imported for the files, which the streaming parser can not parse
+    from rdflib.graph import Graph
+    g = Graph()
+    g.parse(file_location, format="xml")
+    return [(str(s), str(p), str(o)) for s, p, o in g.triples((None, None, None)) if str(p) not in excluded_predicates]
+
+
+def _start_property(element: ET.Element, parent: _Frame, base: str, new_blank_node, blank_node, emit,
+                    stack: list[_Frame]) -> Iterator[Triple]:
+    """Handles the start of a property element of the node `parent`."""
+    predicate = _uri(element.tag)
+    if predicate == RDF_NS + "li":
+        parent.li_counter += 1
+        predicate = f"{RDF_NS}_{parent.li_counter}"
+    frame = _Frame(is_node=False, base=base, subject=parent.subject, predicate=predicate,
+                   parse_type=element.get(f"{{{RDF_NS}}}parseType"))
+
+    if frame.parse_type == "Resource":
+        # the property elements of the element describe a new blank node
+        obj = new_blank_node()
+        yield from emit(parent.subject, predicate, obj)
+        stack.append(_Frame(is_node=True, base=base, subject=obj))
+        return
+    if frame.parse_type == "Literal":
+        frame.literal_depth = 1
+        stack.append(frame)
+        return
+    if frame.parse_type is None or frame.parse_type == "Collection":
+        resource = element.get(f"{{{RDF_NS}}}resource")
+        node_id = element.get(f"{{{RDF_NS}}}nodeID")
+        if resource is not None or node_id is not None:
+            obj = _resolve(resource, base) if resource is not None else blank_node(node_id)
+            frame.has_object = True
+            yield from emit(parent.subject, predicate, obj)
+            yield from _property_attributes(element, obj, base, emit)
+    else:
+        # unknown parse types are handled like "Literal"
+        frame.literal_depth = 1
+    stack.append(frame)
+
+
+def _end_property(element: ET.Element, frame: _Frame, new_blank_node, emit) -> Iterator[Triple]:
+    """Handles the end of a property element, i.e. literals, empty elements and collections."""
+    if frame.parse_type == "Collection":
+        head = RDF_NIL
+        for item in reversed(frame.items):
+            node = new_blank_node()
+            yield from emit(node, RDF_FIRST, item)
+            yield from emit(node, RDF_REST, head)
+            head = node
+        yield from emit(frame.subject, frame.predicate, head)
+    elif frame.literal_depth:
+        parts = [escape(element.text or "")]
+        for child in element:
+            _serialize_literal_element(child, frame.literal_prefixes, {XML_NS: "xml"}, parts)
+        yield from emit(frame.subject, frame.predicate, _normalize_xml_literal("".join(parts)))
+    elif not frame.has_object:
+        attributes = [name for name in element.attrib if _is_property_attribute(name)]
+        if attributes:
+            # empty property element with property attributes, they describe a new blank node
+            obj = new_blank_node()
+            yield from emit(frame.subject, frame.predicate, obj)
+            yield from _property_attributes(element, obj, frame.base, emit)
+        else:
+            yield from emit(frame.subject, frame.predicate, element.text or "")
+
+
+def _serialize_literal_element(element: ET.Element, prefixes: dict[ET.Element, dict[str, str]],
+                               declared: dict[str, str], parts: list[str]) -> None:
+    """
+    Serializes an element of a rdf:parseType="Literal" property like rdflib: the prefixes of the document are kept and
+    the namespace of an element is declared, unless an enclosing element of the literal declared it.
+    """
+    declared = declared.copy()
+    namespace, name = _split_name(element.tag)
+    tag = name
+    declaration = ""
+    if namespace:
+        prefix = prefixes[element].get(namespace)
+        tag = f"{prefix}:{name}" if prefix else name
+        if namespace not in declared:
+            declared[namespace] = prefix
+            declaration = f' xmlns:{prefix}="{namespace}"' if prefix else f' xmlns="{namespace}"'
+    attributes = []
+    for attribute, value in element.attrib.items():
+        namespace, attribute = _split_name(attribute)
+        if namespace:
+            declared.setdefault(namespace, prefixes[element].get(namespace))
+            attribute = f"{declared[namespace]}:{attribute}"
+        attributes.append(f" {attribute}={quoteattr(value)}")
+
+    parts.append(f"<{tag}{declaration}{''.join(attributes)}>{escape(element.text or '')}")
+    for child in element:
+        _serialize_literal_element(child, prefixes, declared, parts)
+    parts.append(f"</{tag}>{escape(element.tail or '')}")
+
+
+def _normalize_xml_literal(text: str) -> str:
+    """Normalizes the lexical form of a rdf:XMLLiteral like rdflib, which serializes it again with minidom."""
+    # minidom is only imported for files with rdf:parseType="Literal" properties
+    from xml.dom import minidom
+    from xml.parsers.expat import ExpatError
+
+    try:
+        document = minidom.parseString(f"<literal>{text}</literal>")
+    except ExpatError:
+        # e.g. undeclared prefixes of attributes, rdflib keeps those literals as they are
+        return text
+    document.normalize()
+    return "".join(node.toxml() for node in document.documentElement.childNodes)
+
+
+def _property_attributes(element: ET.Element, subject: str, base: str, emit) -> Iterator[Triple]:
+    """Yields the triples of the property attributes of an element, their values are literals (or the rdf:type)."""
+    for name, value in element.attrib.items():
+        if _is_property_attribute(name):
+            predicate = _uri(name)
+            yield from emit(subject, predicate, _resolve(value, base) if predicate == RDF_TYPE else value)
+
+
+def _is_property_attribute(name: str) -> bool:
+    """Returns whether an attribute is a property, i.e. qualified and neither rdf syntax nor xml attribute."""
+    return name.startswith("{") and name not in SYNTAX_ATTRIBUTES and not name.startswith(f"{{{XML_NS}}}")
+
+
+def _subject(element: ET.Element, base: str, new_blank_node, blank_node) -> str:
+    """Returns the subject of a node element."""
+    about = element.get(f"{{{RDF_NS}}}about")
+    if about is not None:
+        return _resolve(about, base)
+    rdf_id = element.get(f"{{{RDF_NS}}}ID")
+    if rdf_id is not None:
+        return urldefrag(base)[0] + "#" + rdf_id
+    node_id = element.get(f"{{{RDF_NS}}}nodeID")
+    if node_id is not None:
+        return blank_node(node_id)
+    return new_blank_node()
+
+
+def _base(element: ET.Element, inherited: str) -> str:
+    """Returns the base URI of an element, which is inherited unless it is set with xml:base."""
+    base = element.get(XML_BASE)
+    return inherited if base is None else _resolve(base, inherited)
+
+
+def _resolve(uri: str, base: str) -> str:
+    """Resolves a (relative) URI reference against the base URI."""
+    return urljoin(base, uri) if uri else urldefrag(base)[0]
+
+
+def _split_name(name: str) -> tuple[Optional[str], str]:
+    """Splits an element or attribute name of ElementTree ({namespace}local) into its namespace and local name."""
+    if name.startswith("{"):
+        namespace, local = name[1:].split("}", 1)
+        return namespace, local
+    return None, name
+
+
+def _uri(name: str) -> str:
+    """Converts an element or attribute name of ElementTree ({namespace}local) to its URI."""
+    return name[1:].replace("}", "", 1) if name.startswith("{") else name
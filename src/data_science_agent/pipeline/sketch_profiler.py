@@ -0,0 +1,373 @@
+import warnings
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from data_science_agent.pipeline.column_profiler import QUANTILES, _field_name, _to_python
+from data_science_agent.utils.profile_error_bounds import ProfileErrorBounds
+
+# values per level of the quantile sketch, the rank error shrinks with the capacity
+QUANTILE_SKETCH_CAPACITY = 512
+# 2 ** precision registers of the distinct count sketch, the standard error is 1.04 / sqrt(2 ** precision) (0.81 %)
+DISTINCT_SKETCH_PRECISION = 14
+# counters of the frequent items sketch, the top value is found, if it occurs in more than 1 / capacity of the rows
+FREQUENT_ITEMS_CAPACITY = 64
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch in the style of KLL. Each level holds at most `capacity` values, a value on level h
+    stands for 2 ** h values. A full level is sorted and every second value (with random offset) is promoted to the
+    next level, which shifts the rank of any value by at most 2 ** h. Those shifts are summed up as deterministic bound
+    of the rank error, quantiles are exact as long as nothing was compacted.
+    """
+
+    def __init__(self, capacity: int = QUANTILE_SKETCH_CAPACITY, seed: int = 0):
+        self.capacity = capacity
+        self.levels: list[np.ndarray] = []
+        self.count = 0
+        self.rank_error = 0
+        self.min = None
+        self.max = None
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds the values (without missing values) to the sketch."""
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.min = values.min() if self.min is None else min(self.min, values.min())
+        self.max = values.max() if self.max is None else max(self.max, values.max())
+        if not self.levels:
+            self.levels.append(values.copy())
+        else:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self.capacity:
+                self._compact(level)
+            level += 1
+
+    def _compact(self, level: int) -> None:
+        """Promotes every second value of a full level to the next level."""
+        values = np.sort(self.levels[level])
+        # an odd value stays on its level, so the weights still add up to the count
+        rest = len(values) % 2
+        promoted = values[rest + self._rng.integers(2)::2]
+        self.levels[level] = values[:rest]
+        if level + 1 == len(self.levels):
+            self.levels.append(promoted)
+        else:
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+        self.rank_error += 2 ** level
+
+    def quantiles(self, quantiles: list[float]) -> list[Any]:
+        """
+        Returns the (approximate) quantiles, exact quantiles are linear interpolated like pandas. The min. (0) and max.
+        (1) are always exact.
+        """
+        if self.count == 0:
+            return [None] * len(quantiles)
+        if self.rank_error == 0:
+            return np.quantile(self.levels[0], quantiles).tolist()
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_values), 2 ** level)
+                                  for level, level_values in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative_weights = values[order], np.cumsum(weights[order])
+        # the value at (zero based) rank r is the first value, whose cumulative weight exceeds r
+        ranks = np.asarray(quantiles) * (self.count - 1)
+        positions = np.minimum(np.searchsorted(cumulative_weights, ranks, side="right"), len(values) - 1)
+        result = values[positions].tolist()
+        return [
+            _to_python(self.min) if quantile == 0 else _to_python(self.max) if quantile == 1 else value
+            for quantile, value in zip(quantiles, result)
+        ]
+
+    def get_relative_rank_error(self) -> Optional[float]:
+        """Returns the bound of the rank error as fraction of the count or None, if the quantiles are exact."""
+        return self.rank_error / self.count if self.rank_error else None
+
+
+class DistinctSketch:
+    """
+    HyperLogLog sketch for the number of distinct values. The first `precision` bits of the 64 bit hash select a
+    register, which keeps the maximum position of the first set bit of the remaining bits.
+    """
+
+    def __init__(self, precision: int = DISTINCT_SKETCH_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Adds the 64 bit hashes of the values to the sketch."""
+        remaining_bits = 64 - self.precision
+        indices = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+        rest = hashes & np.uint64(2 ** remaining_bits - 1)
+        # rest < 2 ** 53 is exact as float, so frexp returns the bit length of rest (0 for rest == 0)
+        bit_lengths = np.frexp(rest.astype(np.float64))[1]
+        np.maximum.at(self.registers, indices, (remaining_bits + 1 - bit_lengths).astype(np.uint8))
+
+    def estimate(self) -> int:
+        """
+        Returns the estimated number of distinct values. The improved estimator of Ertl (2017) is unbiased over the
+        whole range of cardinalities without the empirical bias correction of HyperLogLog++.
+        """
+        registers = len(self.registers)
+        max_rank = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=max_rank + 2).astype(np.float64)
+        denominator = registers * _tau(1 - histogram[max_rank + 1] / registers)
+        for rank in range(max_rank, 0, -1):
+            denominator = 0.5 * (denominator + histogram[rank])
+        denominator += registers * _sigma(histogram[0] / registers)
+        return int(round(registers * registers / (2 * np.log(2) * denominator)))
+
+    def get_relative_error(self) -> float:
+        """Returns the standard error of the estimate as fraction of the number of distinct values."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+
+class FrequentItemsSketch:
+    """
+    Space-saving sketch for the most frequent values, merged chunk by chunk. At most `capacity` values are counted:
+    when more values occur, the values with the smallest counts are dropped (ties in the order of their first
+    occurrence) and the largest dropped count becomes the floor. A value, which is not counted, occurs at most `floor`
+    times, so a value counted later starts at the floor and its count overestimates its frequency by at most its error
+    (the floor, when it was added). The floor is at most n / capacity, all counts are exact while nothing was dropped.
+    """
+
+    def __init__(self, capacity: int = FREQUENT_ITEMS_CAPACITY):
+        self.capacity = capacity
+        self.counters: Optional[Series] = None
+        self.errors: Optional[Series] = None
+        self.error = 0  # the floor
+
+    def update(self, value_counts: Series) -> None:
+        """Adds the value counts of a chunk in the order of their first occurrence to the sketch."""
+        value_counts = value_counts.astype(np.int64)
+        if self.counters is None:
+            counters = value_counts
+            errors = Series(0, index=value_counts.index, dtype=np.int64)
+        else:
+            # values, which are not counted yet, may have occurred up to `floor` times before
+            chunk_errors = Series(np.where(value_counts.index.isin(self.counters.index), 0, self.error),
+                                  index=value_counts.index, dtype=np.int64)
+            # the groups keep the order of the first occurrence
+            counters = pd.concat([self.counters, value_counts + chunk_errors]).groupby(level=0, sort=False).sum()
+            errors = pd.concat([self.errors, chunk_errors]).groupby(level=0, sort=False).sum()
+
+        if len(counters) > self.capacity:
+            order = np.argsort(-counters.to_numpy(), kind="stable")
+            self.error = max(self.error, int(counters.iloc[order[self.capacity:]].max()))
+            kept = np.sort(order[:self.capacity])
+            counters, errors = counters.iloc[kept], errors.iloc[kept]
+        self.counters, self.errors = counters, errors
+
+    def top(self) -> tuple[Any, Optional[int]]:
+        """
+        Returns the most frequent value and the lower bound of its frequency. Ties are broken by the first occurrence
+        like `describe()`.
+        """
+        if self.counters is None or len(self.counters) == 0:
+            return None, None
+        guaranteed = (self.counters - self.errors).to_numpy()
+        position = int(np.argmax(guaranteed))
+        return _to_python(self.counters.index[position]), int(guaranteed[position])
+
+
+def sketch_profile_columns(chunks: Iterable[DataFrame],
+                           schema: dict[str, str]) -> tuple[list[dict[str, Any]], list[ProfileErrorBounds]]:
+    """
+    Computes the descriptive statistics of all columns in one pass over the chunks with bounded memory per column,
+    the approximate counterpart of `profile_columns`.
+
+    Count, mean, std, min. and max. are exact, the percentiles come from a quantile sketch. Unique, top and freq come
+    from a distinct count and a frequent items sketch, they are exact as long as the column has at most
+    `FREQUENT_ITEMS_CAPACITY` distinct values.
+
+    :param chunks: The chunks of the dataset with the (cleaned) column names of the schema.
+    :param schema: The column names and dtypes of the dataset.
+    :return: One dictionary per column in the order of the schema, keyed by the field names of `DescriptionBase`,
+    and the error bounds of each column.
+    """
+    profilers = [_ColumnSketches(name, _parse_dtype(dtype)) for name, dtype in schema.items()]
+    numeric = [profiler for profiler in profilers if profiler.kind == "numeric"]
+    moments = _Moments(len(numeric))
+
+    for chunk in chunks:
+        if numeric:
+            values = chunk[[profiler.column_name for profiler in numeric]].to_numpy(dtype=np.float64, na_value=np.nan)
+            moments.update(values)
+            for position, profiler in enumerate(numeric):
+                column = values[:, position]
+                profiler.quantiles.update(column[~np.isnan(column)])
+        for profiler in profilers:
+            if profiler.kind != "numeric":
+                profiler.update(chunk[profiler.column_name])
+
+    for profiler, (count, mean, std) in zip(numeric, moments.result()):
+        profiler.count, profiler.mean, profiler.std = count, mean, std
+    return [profiler.profile() for profiler in profilers], [profiler.error_bounds() for profiler in profilers]
+
+
+class _ColumnSketches:
+    """Collects the sketches of one column, numeric columns get their moments from `_Moments`."""
+
+    def __init__(self, column_name: str, dtype):
+        self.column_name = column_name
+        self.dtype = dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            self.kind = "categorical"
+        elif pd.api.types.is_numeric_dtype(dtype):
+            self.kind = "numeric"
+        elif pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+            self.kind = "temporal"
+        else:
+            self.kind = "categorical"
+        self.count = 0
+        self.mean: Optional[float] = None
+        self.std: Optional[float] = None
+        self.quantiles = QuantileSketch()
+        self.distinct = DistinctSketch()
+        self.frequent = FrequentItemsSketch()
+        self._temporal_moments = _Moments(1)
+
+    def update(self, column: Series) -> None:
+        """Adds the values of a non numeric column of a chunk."""
+        if self.kind == "temporal":
+            # timestamps / timedeltas are sketched as integers in the unit of the dtype
+            values = column.dropna().array.asi8
+            self.count += len(values)
+            self._temporal_moments.update(values.astype(np.float64).reshape(-1, 1))
+            self.quantiles.update(values)
+            return
+        value_counts = column.value_counts(sort=False)
+        value_counts = value_counts[value_counts > 0]
+        self.count += int(value_counts.sum())
+        self.frequent.update(value_counts)
+        # the distinct count only depends on the distinct values of the chunk
+        self.distinct.update(pd.util.hash_pandas_object(value_counts.index.to_series(), index=False).to_numpy())
+
+    def profile(self) -> dict[str, Any]:
+        """Returns the statistics of the column keyed by the field names of `DescriptionBase`."""
+        profile: dict[str, Any] = {"column_name": self.column_name, "count": float(self.count)}
+        if self.kind == "categorical":
+            top, freq = self.frequent.top()
+            exact = self.frequent.error == 0
+            unique = len(self.frequent.counters) if exact and self.frequent.counters is not None \
+                else self.distinct.estimate()
+            profile.update(unique=unique, top=top, freq=freq)
+            return profile
+
+        values = self.quantiles.quantiles([0.0, *QUANTILES.values(), 1.0])
+        names = ["min", *QUANTILES, "max"]
+        if self.kind == "numeric":
+            profile.update(mean=self.mean, std=self.std)
+            profile.update({_field_name(name): value for name, value in zip(names, values)})
+            return profile
+
+        _, mean, std = self._temporal_moments.result()[0]
+        profile["mean"] = None if mean is None else _temporal_isoformat(mean, self.dtype)
+        if pd.api.types.is_timedelta64_dtype(self.dtype):
+            # describe() only has the std. deviation of timedeltas
+            profile["std"] = None if std is None else _temporal_isoformat(std, self.dtype)
+        profile.update({
+            _field_name(name): None if value is None else _temporal_isoformat(value, self.dtype)
+            for name, value in zip(names, values)
+        })
+        return profile
+
+    def error_bounds(self) -> ProfileErrorBounds:
+        """Returns the error bounds of the statistics of the column."""
+        exact = self.frequent.error == 0
+        return ProfileErrorBounds(
+            column_name=self.column_name,
+            quantile_rank_error=self.quantiles.get_relative_rank_error(),
+            unique_relative_error=None if exact else float(self.distinct.get_relative_error()),
+            freq_error=None if exact else self.frequent.error,
+        )
+
+
+class _Moments:
+    """Exact count, mean and std. deviation of the numeric columns, merged chunk by chunk (Chan et al.)."""
+
+    def __init__(self, columns: int):
+        self.count = np.zeros(columns)
+        self.mean = np.zeros(columns)
+        self.squared_deviations = np.zeros(columns)
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds the values of a chunk, one column per numeric column."""
+        count = np.count_nonzero(~np.isnan(values), axis=0)
+        with warnings.catch_warnings():
+            # columns of the chunk without values
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nan_to_num(np.nanmean(values, axis=0))
+        squared_deviations = np.nansum((values - mean) ** 2, axis=0)
+
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, count / total, 0.0)
+        self.mean += delta * weight
+        self.squared_deviations += squared_deviations + delta ** 2 * self.count * weight
+        self.count = total
+
+    def result(self) -> list[tuple[int, Optional[float], Optional[float]]]:
+        """Returns the count, mean and sample std. deviation of each column, None for undefined statistics."""
+        return [
+            (
+                int(count),
+                float(mean) if count > 0 else None,
+                float(np.sqrt(squared_deviations / (count - 1))) if count > 1 else None,
+            )
+            for count, mean, squared_deviations in zip(self.count, self.mean, self.squared_deviations)
+        ]
+
+
+def _sigma(x: float) -> float:
+    """Correction of the improved HyperLogLog estimator for empty registers."""
+    if x == 1:
+        return np.inf
+    power, result, previous = 1.0, x, -1.0
+    while result != previous:
+        x *= x
+        previous = result
+        result += x * power
+        power += power
+    return result
+
+
+def _tau(x: float) -> float:
+    """Correction of the improved HyperLogLog estimator for saturated registers."""
+    if x == 0 or x == 1:
+        return 0.0
+    power, result, previous = 1.0, 1 - x, 0.0
+    while result != previous:
+        x = np.sqrt(x)
+        previous = result
+        power *= 0.5
+        result -= (1 - x) ** 2 * power
+    return result / 3
+
+
+def _parse_dtype(dtype: str):
+    """Parses a dtype of the schema, unknown dtypes are profiled like strings."""
+    try:
+        return pd.api.types.pandas_dtype(dtype)
+    except TypeError:
+        return np.dtype(object)
+
+
+def _temporal_isoformat(value: float, dtype) -> str:
+    """Converts an integer of the unit of the datetime / timedelta dtype to its ISO 8601 representation."""
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return pd.Timestamp(int(round(value)), unit=dtype.unit, tz="UTC").tz_convert(dtype.tz).isoformat()
+    unit = np.datetime_data(dtype)[0]
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return pd.Timedelta(int(round(value)), unit=unit).isoformat()
+    return pd.Timestamp(int(round(value)), unit=unit).isoformat()
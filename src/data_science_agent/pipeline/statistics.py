@@ -3,7 +3,8 @@ from pathlib import Path
 
 from data_science_agent.dtos.wrapper.visualization import VisualizationWrapper
 from data_science_agent.graph import AgentState
-from data_science_agent.utils import print_color, MAX_REGENERATION_ATTEMPTS, AGENT_LANGUAGE
+from data_science_agent.utils import print_color, MAX_REGENERATION_ATTEMPTS, AGENT_LANGUAGE, get_llm_pool_stats, \
+    get_agent_cache_stats
 from data_science_agent.utils.enums import Color
 
 
@@ -50,7 +51,9 @@ def print_statistics(state: AgentState) -> AgentState:
 
     # Total values
     total_duration = sum(d.get_total_duration() or 0 for d in state["durations"])
-    total_tokens = sum(m.token_usage.total_tokens or 0 for m in state["llm_metadata"])
+    # responses of the cache did not use any tokens
+    total_tokens = sum(m.token_usage.total_tokens or 0 for m in state["llm_metadata"] if not m.cache_hit)
+    cache_hits = sum(m.cache_hit for m in state["llm_metadata"])
     total_cost = sum(m.cost_details.total_cost or 0.0 for m in state["llm_metadata"])
 
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -66,6 +69,7 @@ def print_statistics(state: AgentState) -> AgentState:
         f"Total Duration: {total_duration:.2f} seconds",
         f"Total Token Usage: {total_tokens} tokens",
         f"Total Costs: ${total_cost:.4f}",
+        f"LLM Response Cache Hits: {cache_hits} / {len(state['llm_metadata'])}",
         "=" * 60,
     ]
 
@@ -84,18 +88,60 @@ def print_statistics(state: AgentState) -> AgentState:
         f.write("=" * 60 + "\n")
         for duration in state["durations"]:
             f.write(f"Method: {duration.method_name}\n")
-            f.write(f"  Duration: {duration.get_total_duration():.4f} seconds\n\n")
+            f.write(f"  Duration: {duration.get_total_duration():.4f} seconds\n")
+            for key, value in duration.details.items():
+                f.write(f"  {key}: {value}\n")
+            f.write("\n")
 
         f.write("\n")
 
+        # Dataset Memory Statistics
+        if state.get("dataset_compaction"):
+            f.write("=" * 60 + "\n")
+            f.write("Dataset Memory Statistics:\n")
+            f.write("=" * 60 + "\n")
+            for compaction in state["dataset_compaction"]:
+                f.write(f"Column: {compaction.column_name}\n")
+                f.write(f"  Dtype: {compaction.old_dtype} -> {compaction.new_dtype}\n")
+                f.write(f"  Memory: {compaction.bytes_before} -> {compaction.bytes_after} bytes "
+                        f"(saved {compaction.get_saved_bytes()} bytes)\n\n")
+            f.write("\n")
+
+        # Approximated Description Statistics
+        approximated = [bounds for bounds in state.get("description_error_bounds") or [] if not bounds.is_exact()]
+        if approximated:
+            f.write("=" * 60 + "\n")
+            f.write("Approximated Description Statistics:\n")
+            f.write("=" * 60 + "\n")
+            for bounds in approximated:
+                f.write(f"Column: {bounds.column_name}\n")
+                if bounds.quantile_rank_error is not None:
+                    f.write(f"  Percentiles: rank error <= {bounds.quantile_rank_error:.4%} of the count\n")
+                if bounds.unique_relative_error is not None:
+                    f.write(f"  Unique: standard error {bounds.unique_relative_error:.2%}\n")
+                if bounds.freq_error is not None:
+                    f.write(f"  Freq: underestimated by <= {bounds.freq_error} rows\n")
+                f.write("\n")
+            f.write("\n")
+
         # LLM Cost & Token Statistics
         f.write("=" * 60 + "\n")
         f.write("LLM Cost & Token Statistics:\n")
         f.write("=" * 60 + "\n")
+        pool_stats = get_llm_pool_stats()
+        f.write(f"LLM client pool (since process start): {pool_stats.hits} hits, {pool_stats.misses} misses, "
+                f"{pool_stats.size} clients ({pool_stats.get_hit_rate():.2%} hit rate)\n")
+        agent_stats = get_agent_cache_stats()
+        f.write(f"Agent cache (since process start): {agent_stats.hits} hits, {agent_stats.misses} misses, "
+                f"{agent_stats.size} agents\n\n")
         for metadata in state["llm_metadata"]:
             f.write(f"Method: {metadata.method_name}\n")
             f.write(f"  Model: {metadata.model_name}\n")
             f.write(f"  Token total: {metadata.token_usage.total_tokens} tokens\n")
+            if metadata.cache_hit:
+                f.write("  Response cache hit: no tokens used\n")
+            if metadata.prompt_tokens_saved:
+                f.write(f"  Prompt tokens saved: {metadata.prompt_tokens_saved} tokens\n")
             f.write(f"  Costs total: ${metadata.cost_details.total_cost:.4f}\n\n")
 
         # Evaluation Results
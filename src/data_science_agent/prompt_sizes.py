@@ -0,0 +1,18 @@
+import importlib
+import pkgutil
+
+import data_science_agent.pipeline.llm_operations as llm_operations
+from data_science_agent.language import get_prompt_templates
+from data_science_agent.utils import AGENT_LANGUAGE
+
+# the prompts are registered, when the modules of the llm operations are imported
+for module in pkgutil.iter_modules(llm_operations.__path__):
+    importlib.import_module(f"{llm_operations.__name__}.{module.name}")
+
+templates = get_prompt_templates(AGENT_LANGUAGE)
+print(f"{'Prompt':<28} {'Key':<44} {'Chars':>6} {'Tokens':>6}  Fields")
+for template in templates:
+    fields = ", ".join(sorted(template.fields)) or "(static)"
+    print(f"{template.name:<28} {template.key:<44} {template.get_chars():>6} {template.get_tokens():>6}  {fields}")
+print(f"{'Total':<73} {sum(template.get_chars() for template in templates):>6} "
+      f"{sum(template.get_tokens() for template in templates):>6}")
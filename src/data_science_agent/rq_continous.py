@@ -3,9 +3,13 @@ import random
 import traceback
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from time import time
+from typing import Optional
 from tqdm import tqdm
 
 from data_science_agent.graph import build_graph, AgentState
+from data_science_agent.pipeline import prepare_shared_dataset, prepare_shared_metadata
+from data_science_agent.pipeline.metadata_analysis import excluded_predicates_uris
+from data_science_agent.pipeline.nltk_resources import ensure_nltk_resources
 from data_science_agent.utils import print_color, enums
 
 STUDY_DIR = "./src/resources/data/study"
@@ -16,8 +20,11 @@ SEED = 8641254
 random.seed(SEED)
 
 
-def process_dataset(dataset: str, run_id: int) -> tuple[str, bool, str]:
-    """Worker-Funktion, die einen einzelnen Datensatz einmal verarbeitet."""
+def process_dataset(dataset: str, run_id: int, dataset_cache_key: Optional[str] = None) -> tuple[str, bool, str]:
+    """
+    Worker-Funktion, die einen einzelnen Datensatz einmal verarbeitet.
+    Mit dem Cache-Key wird der vom Elternprozess vorbereitete Datensatz geladen (memory mapped).
+    """
     iteration_start = time()
     dataset_path = os.path.join(STUDY_DIR, dataset)
     output_dir = os.path.join(OUTPUT_BASE, dataset, f"run_{run_id}")
@@ -37,6 +44,7 @@ def process_dataset(dataset: str, run_id: int) -> tuple[str, bool, str]:
         state: AgentState = {
             "dataset_dir": dataset_path,
             "dataset_path": os.path.join(dataset_path, "dataset.csv"),
+            "dataset_cache_key": dataset_cache_key,
             "metadata_path": os.path.join(dataset_path, "metadata.rdf"),
             "regeneration_attempts": 0,
             "programming_language": enums.ProgrammingLanguage.PYTHON,
@@ -72,6 +80,15 @@ def main():
     selected = random.sample(selected_datasets, 5)
     print_color(f"Selected datasets for this run: {selected}", enums.Color.OK_CYAN)
 
+    # Jeder Datensatz wird nur einmal eingelesen, alle Worker teilen sich die memory mapped Datei im Cache
+    # große Datensätze (DATASET_STREAMING_MIN_MB) werden nicht vorbereitet, die Worker lesen sie streamend
+    cache_keys = {ds: prepare_shared_dataset(os.path.join(STUDY_DIR, ds, "dataset.csv")) for ds in selected}
+    # die Metadaten werden ebenfalls nur einmal geparst, die Worker laden die gefilterten Tripel aus dem Cache
+    for ds in selected:
+        prepare_shared_metadata(os.path.join(STUDY_DIR, ds, "metadata.rdf"), excluded_predicates_uris)
+    # fehlende NLTK-Daten werden einmal lokal abgelegt, statt in jedem Worker heruntergeladen zu werden
+    ensure_nltk_resources()
+
     # Erstelle alle (dataset, run_id)-Kombinationen
     runs = [(ds, i) for ds in selected for i in range(1, 6)]  # 5 runs pro Datensatz
 
@@ -82,7 +99,7 @@ def main():
     print_color(f"Starting parallel processing with {MAX_WORKERS} workers …", enums.Color.OK_BLUE)
 
     with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {executor.submit(process_dataset, ds, run): (ds, run) for ds, run in runs}
+        futures = {executor.submit(process_dataset, ds, run, cache_keys[ds]): (ds, run) for ds, run in runs}
 
         for future in tqdm(as_completed(futures), total=len(futures), desc="Processing datasets"):
             dataset, run_id = futures[future]
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+from collections import defaultdict
+from statistics import median
+from time import perf_counter
+
+# module measured by the benchmark, every worker process imports it before its first run
+MODULE = "data_science_agent.pipeline"
+REPEATS = 5
+TOP_PACKAGES = 15
+
+
+def import_times() -> dict[str, int]:
+    """Imports the module in a new interpreter with `-X importtime` and returns the self time per module in µs."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_time)
+    return times
+
+
+def startup_time() -> float:
+    """Returns the wall time of a new interpreter importing the module in seconds."""
+    start = perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {MODULE}"], capture_output=True, check=True)
+    return perf_counter() - start
+
+
+times = import_times()
+packages = defaultdict(int)
+for name, self_time in times.items():
+    packages[name.split(".")[0]] += self_time
+
+print(f"Import of {MODULE}: {sum(times.values()) / 1e6:.2f} s in {len(times)} modules")
+print(f"{'Package':<32} {'Self time':>10}")
+for package, self_time in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]:
+    print(f"{package:<32} {self_time / 1e6:>9.3f}s")
+print(f"Startup (median of {REPEATS}): {median(startup_time() for _ in range(REPEATS)):.2f} s")
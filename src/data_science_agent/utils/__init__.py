@@ -1,7 +1,18 @@
 from data_science_agent.utils import enums
-from data_science_agent.utils.config import AGENT_LANGUAGE, BASE_URL, MAX_REGENERATION_ATTEMPTS, OPENROUTER_API_KEY
+from data_science_agent.utils.config import AGENT_LANGUAGE, BASE_URL, MAX_REGENERATION_ATTEMPTS, OPENROUTER_API_KEY, \
+    DATASET_CACHE_DIR, DATASET_CACHE_MAX_MB, DATASET_COMPACT_DTYPES, DATASET_STREAMING_MIN_MB, \
+    DATASET_SKETCH_PROFILING, DATASET_PROFILE_CACHE_MAX_MB, DATASET_PROFILING_WORKERS, METADATA_CACHE_MAX_MB, \
+    METADATA_TOKEN_BUDGET, CONTEXT_TOKEN_BUDGETS, NLTK_DATA_DIR, LLM_CACHE_PATH, LLM_CACHE_MAX_MB, LLM_CACHE_TTL_HOURS, \
+    LLM_CACHE_EXCLUDED_NODES, LLM_CASSETTE_MODE, LLM_CASSETTE_DIR, LLM_CASSETTE_LATENCY
 from data_science_agent.utils.print_color import print_color
 from data_science_agent.utils.pipeline import get_llm_model
+from data_science_agent.utils.llm_pool import LLMPoolStats, get_llm_pool_stats, clear_llm_pool
+from data_science_agent.utils.agent_cache import AgentCacheStats, get_agent, get_agent_cache_stats
 from data_science_agent.utils.llm_metadata import LLMMetadata
 from data_science_agent.utils.duration_metadata import DurationMetadata
+from data_science_agent.utils.column_compaction import ColumnCompaction
+from data_science_agent.utils.dataset_handle import DatasetHandle
+from data_science_agent.utils.profile_error_bounds import ProfileErrorBounds
+from data_science_agent.utils.triple_store import TripleStore
+from data_science_agent.utils.condensed_metadata import CondensedMetadata
 from data_science_agent.utils.inter_rater_agreement import cohen_kappa_agreement, icc_agreement
\ No newline at end of file
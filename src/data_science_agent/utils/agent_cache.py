@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from data_science_agent.utils.enums import LLMModel
+from data_science_agent.utils.pipeline import get_llm_model
+
+if TYPE_CHECKING:
+    from langchain_core.messages import SystemMessage
+
+# compiled agents kept per process, the system prompts of some nodes differ per dataset
+AGENT_CACHE_SIZE = 64
+
+
+@dataclass
+class AgentCacheStats:
+    """Counters of the compiled agent cache of the current process."""
+    hits: int
+    misses: int
+    size: int
+
+
+class _AgentCache:
+    """Least recently used cache of compiled agents keyed by model, response format and system prompt."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def after_fork(self) -> None:
+        """Starts the forked child with an empty cache, the agents use the connections of the parent."""
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._agents: OrderedDict[tuple, tuple[Any, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: LLMModel, response_format: Optional[type], system_prompt: Union[str, "SystemMessage", None]):
+        """Returns the cached agent or compiles it, if it is not cached or its model client was replaced."""
+        from langchain.agents import create_agent
+
+        llm = get_llm_model(model)
+        key = (model.value, response_format, _prompt_digest(system_prompt))
+        with self._lock:
+            entry = self._agents.get(key)
+            # a new client (e.g. of another event loop or after clearing the pool) needs a new agent
+            if entry is not None and entry[0] is llm:
+                self._agents.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        agent = create_agent(model=llm, response_format=response_format, system_prompt=system_prompt)
+        with self._lock:
+            self._agents[key] = (llm, agent)
+            self._agents.move_to_end(key)
+            while len(self._agents) > AGENT_CACHE_SIZE:
+                self._agents.popitem(last=False)
+        return agent
+
+    def get_stats(self) -> AgentCacheStats:
+        with self._lock:
+            return AgentCacheStats(hits=self.hits, misses=self.misses, size=len(self._agents))
+
+
+def _prompt_digest(system_prompt: Union[str, "SystemMessage", None]) -> Optional[str]:
+    """Returns the hash of the system prompt, messages are hashed by their content."""
+    from langchain_core.messages import SystemMessage
+
+    if system_prompt is None:
+        return None
+    content = system_prompt.content if isinstance(system_prompt, SystemMessage) else system_prompt
+    prefix = "message:" if isinstance(system_prompt, SystemMessage) else "text:"
+    return hashlib.sha256((prefix + str(content)).encode("utf-8")).hexdigest()
+
+
+_cache = _AgentCache()
+# forked workers (e.g. of a ProcessPoolExecutor) must not reuse the agents and connections of the parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_cache.after_fork)
+
+
+def get_agent(model: LLMModel, response_format: Optional[type] = None,
+              system_prompt: Union[str, "SystemMessage", None] = None):
+    """
+    Returns the compiled agent (`create_agent`) of the model, response format and system prompt. Agents are compiled
+    once per process and reused by all calls with the same arguments, e.g. for every visualization of a run.
+
+    :param model: The model of the agent.
+    :param response_format: The DTO class of the structured response.
+    :param system_prompt: The system prompt as text or message.
+    :return: The compiled agent.
+    """
+    return _cache.get(model, response_format, system_prompt)
+
+
+def get_agent_cache_stats() -> AgentCacheStats:
+    """Returns the hit and miss counters of the compiled agent cache of the current process."""
+    return _cache.get_stats()
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import tempfile
+import time
+from typing import Callable
+
+# temporary files of crashed writers are removed after this time
+STALE_TMP_SECONDS = 3600
+
+
+def file_digest(path: str) -> str:
+    """Returns the sha256 hex digest of the file content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def atomic_write(path: str, write_func: Callable[[str], None]) -> None:
+    """
+    Writes a file atomically. `write_func` writes to a temporary file in the same directory, which then replaces the
+    target path. Concurrent readers therefore only ever see complete files, concurrent writers the last complete one.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Writes the given bytes atomically to the path."""
+    def write(tmp_path: str):
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+    atomic_write(path, write)
+
+
+def touch(path: str) -> None:
+    """Marks a cache entry as recently used. Entries removed by another process are ignored."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def evict_lru(directory: str, max_bytes: int, suffix: str, companion_suffixes: tuple[str, ...] = ()) -> None:
+    """
+    Removes the least recently used cache entries (by modification time) until the entries ending with `suffix` fit
+    into `max_bytes`. Companion files of an entry (same name, other suffix) are removed together with it.
+    Files vanishing during the eviction were removed by another process and are skipped.
+    """
+    entries = []
+    now = time.time()
+    for entry in os.scandir(directory):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if entry.name.endswith(".tmp") and now - stat.st_mtime > STALE_TMP_SECONDS:
+            _remove(entry.path)
+        elif entry.name.endswith(suffix):
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        stem = path.removesuffix(suffix)
+        # remove companions first, so a reader never finds them without the main entry
+        for companion_suffix in companion_suffixes:
+            _remove(stem + companion_suffix)
+        _remove(path)
+        total -= size
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        # files which are still memory mapped can not be removed on windows, they are evicted next time
+        pass
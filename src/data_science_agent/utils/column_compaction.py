@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ColumnCompaction:
+    """Keeps track of the dtype change and the memory usage of a compacted dataset column."""
+    column_name: str
+    old_dtype: str
+    new_dtype: str
+    bytes_before: int
+    bytes_after: int
+
+    def get_saved_bytes(self) -> int:
+        """Returns the saved memory in bytes."""
+        return self.bytes_before - self.bytes_after
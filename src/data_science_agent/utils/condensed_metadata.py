@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class CondensedMetadata:
+    """Metadata, which was condensed to fit the token budget of the prompts."""
+    text: str
+    original_tokens: int  # tokens of the complete metadata as rendered before (`str` of all triples)
+    condensed_tokens: int
+    original_triples: int
+    selected_triples: int
+
+    def get_saved_tokens(self) -> int:
+        """Returns the tokens saved per prompt, which contains the metadata."""
+        return max(self.original_tokens - self.condensed_tokens, 0)
@@ -18,9 +18,41 @@ def __load_language() -> Language:
     return Language.DE
 
 
+def __load_context_token_budgets() -> dict[str, int]:
+    """
+    Loads the token budgets of the prompt contexts per node, e.g. "llm_generate_summary=6000,default=4000". Nodes
+    without a budget use the "default" budget, no budget (or 0) keeps the contexts unchanged.
+    """
+    budgets = {}
+    for entry in os.getenv("CONTEXT_TOKEN_BUDGETS", "").split(","):
+        if entry.strip():
+            node, _, budget = entry.partition("=")
+            budgets[node.strip()] = int(budget)
+    return budgets
+
+
 load_dotenv()
 
 MAX_REGENERATION_ATTEMPTS = int(os.getenv("MAX_REGENERATION_ATTEMPTS", "3"))
 OPENROUTER_API_KEY = os.getenv("PRIVAT_OPENROUTER_API_KEY")
 BASE_URL = "https://openrouter.ai/api/v1"
 AGENT_LANGUAGE = __load_language()
+DATASET_CACHE_DIR = os.getenv("DATASET_CACHE_DIR", "./src/resources/cache/datasets")
+DATASET_CACHE_MAX_MB = int(os.getenv("DATASET_CACHE_MAX_MB", "1024"))  # 0 disables the cache
+DATASET_COMPACT_DTYPES = os.getenv("DATASET_COMPACT_DTYPES", "false").lower() == "true"
+DATASET_STREAMING_MIN_MB = int(os.getenv("DATASET_STREAMING_MIN_MB", "1024"))  # 0 disables streaming
+DATASET_SKETCH_PROFILING = os.getenv("DATASET_SKETCH_PROFILING", "false").lower() == "true"
+DATASET_PROFILE_CACHE_MAX_MB = int(os.getenv("DATASET_PROFILE_CACHE_MAX_MB", "64"))  # 0 disables the cache
+METADATA_CACHE_MAX_MB = int(os.getenv("METADATA_CACHE_MAX_MB", "64"))  # 0 disables the cache
+METADATA_TOKEN_BUDGET = int(os.getenv("METADATA_TOKEN_BUDGET", "0"))  # 0 disables the condensation
+CONTEXT_TOKEN_BUDGETS = __load_context_token_budgets()
+TIKTOKEN_CACHE_DIR = os.path.abspath(os.getenv("TIKTOKEN_CACHE_DIR", "./src/resources/cache/tiktoken"))
+NLTK_DATA_DIR = os.path.abspath(os.getenv("NLTK_DATA_DIR", "./src/resources/nltk_data"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./src/resources/cache/llm/responses.sqlite")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "0"))  # 0 disables the cache
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # 0 keeps the entries until they are evicted
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()  # off, record or replay
+LLM_CASSETTE_DIR = os.getenv("LLM_CASSETTE_DIR", "./src/resources/cassettes")
+LLM_CASSETTE_LATENCY = os.getenv("LLM_CASSETTE_LATENCY", "false").lower() == "true"
+LLM_CACHE_EXCLUDED_NODES = [node.strip() for node in os.getenv("LLM_CACHE_EXCLUDED_NODES", "").split(",") if node.strip()]
+DATASET_PROFILING_WORKERS = int(os.getenv("DATASET_PROFILING_WORKERS", "1"))  # 0 uses one worker per cpu core
@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from pandas import CategoricalDtype, DataFrame
+
+# number of rows of the cached previews, those cover the previews used in the prompts
+HEAD_ROWS = 10
+SAMPLE_ROWS = 25
+SAMPLE_RANDOM_STATE = 42
+# rows per chunk of the streaming passes, only one chunk is held in memory at the same time
+CHUNK_ROWS = 100_000
+
+# loads the given columns (or all columns for None) of the dataset, it has to be picklable (e.g. a functools.partial
+# of a module level function), so the handle can be passed to other processes
+DatasetLoader = Callable[[Optional[list[str]]], DataFrame]
+# yields the dataset chunk by chunk, also picklable
+ChunkLoader = Callable[[], Iterator[DataFrame]]
+
+
+@dataclass
+class DatasetHandle:
+    """
+    Lightweight reference to a loaded dataset. It keeps the schema, the row count and small previews, the full
+    DataFrame is only materialised on demand. Pickling a handle (e.g. as part of the agent state returned by a worker
+    process) never includes the full DataFrame.
+    """
+    path: str
+    schema: dict[str, str]  # column name to dtype
+    row_count: int
+    loader: DatasetLoader = field(repr=False)
+    previews: dict[str, DataFrame] = field(default_factory=dict, repr=False)
+    streamed: bool = False  # True for datasets, which are too large to be materialised as a whole
+    chunk_loader: Optional[ChunkLoader] = field(default=None, repr=False)
+    _df: Optional[DataFrame] = field(default=None, repr=False)
+
+    @classmethod
+    def from_dataframe(cls, path: str, df: DataFrame, loader: DatasetLoader) -> "DatasetHandle":
+        """Creates a handle of an already loaded DataFrame, the previews are computed right away."""
+        handle = cls(
+            path=path,
+            schema={str(name): str(dtype) for name, dtype in df.dtypes.items()},
+            row_count=len(df),
+            loader=loader,
+            _df=df,
+        )
+        handle.previews["head"] = _detach(df.head(HEAD_ROWS))
+        handle.previews["sample"] = _detach(_sample(df, SAMPLE_ROWS))
+        return handle
+
+    @property
+    def columns(self) -> list[str]:
+        """Returns the column names of the dataset."""
+        return list(self.schema)
+
+    def head(self, n: int = 5) -> DataFrame:
+        """Returns the first n rows, the cached preview is used if it is large enough."""
+        if n <= HEAD_ROWS:
+            return self.previews["head"].head(n)
+        return self.to_pandas().head(n)
+
+    def sample(self, n: int = SAMPLE_ROWS) -> DataFrame:
+        """Returns a reproducible random sample of n rows (or all rows of smaller datasets)."""
+        if n == SAMPLE_ROWS:
+            return self.previews["sample"]
+        return _sample(self.to_pandas(), n)
+
+    def to_pandas(self) -> DataFrame:
+        """Returns the full DataFrame and loads it, if it is not materialised."""
+        if self._df is None:
+            self._df = self.loader(None)
+        return self._df
+
+    def get_columns(self, columns: list[str]) -> DataFrame:
+        """Returns a DataFrame with the given columns, only those columns are loaded if necessary."""
+        if self._df is not None:
+            return self._df[columns]
+        return self.loader(columns)
+
+    def iter_chunks(self, chunk_rows: int = CHUNK_ROWS) -> Iterator[DataFrame]:
+        """Yields the rows of the dataset in chunks, streamed datasets are read again without materialising them."""
+        if self._df is None and self.chunk_loader is not None:
+            yield from self.chunk_loader()
+            return
+        df = self.to_pandas()
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+
+    def release(self) -> None:
+        """Drops the materialised DataFrame, the schema and previews are kept."""
+        self._df = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_df"] = None
+        return state
+
+
+def _detach(preview: DataFrame) -> DataFrame:
+    """
+    Copies a preview, so it does not reference the buffers of the full DataFrame. Categorical columns are converted
+    to their values, otherwise all categories would be kept (and pickled) with the preview.
+    """
+    preview = preview.copy()
+    for index, dtype in enumerate(preview.dtypes):
+        if isinstance(dtype, CategoricalDtype):
+            preview.isetitem(index, preview.iloc[:, index].astype(dtype.categories.dtype))
+    return preview
+
+
+def _sample(df: DataFrame, n: int) -> DataFrame:
+    """Robust sampling."""
+    sample_size = min(n, len(df))
+    if sample_size == 0:
+        return df
+    return df.sample(n=sample_size, random_state=SAMPLE_RANDOM_STATE, replace=False)
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 
 
 @dataclass
@@ -7,6 +8,7 @@ class DurationMetadata:
     method_name: str
     start: int
     stop: int
+    details: dict[str, Any] = field(default_factory=dict)
 
     def get_total_duration(self) -> int:
         """Returns the total duration in seconds."""
@@ -1,10 +1,11 @@
 import pandas as pd
-import pingouin as pg
-from sklearn.metrics import cohen_kappa_score
 
 
 def cohen_kappa_agreement(eval_1, eval_2):
     """Calculated the cohen kappa between two sets of scores."""
+    # sklearn is only needed for the evaluation and imported, when it runs
+    from sklearn.metrics import cohen_kappa_score
+
     y1 = [
         eval_1.bugs.score,
         eval_1.transformation.score,
@@ -30,6 +31,9 @@ def cohen_kappa_agreement(eval_1, eval_2):
 
 def icc_agreement(evals):
     """Calculates the Intraclass Correlation Coefficient for more than 2 raters."""
+    # pingouin (with scipy and matplotlib) is only needed for the evaluation and imported, when it runs
+    import pingouin as pg
+
     dimensions = ['bugs', 'transformation', 'compliance', 'type', 'encoding', 'aesthetics']
 
     data = pd.DataFrame({'item': dimensions})
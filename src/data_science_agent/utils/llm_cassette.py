@@ -0,0 +1,97 @@
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps
+from langchain_core.outputs import Generation
+
+from data_science_agent.utils.cache import atomic_write_bytes
+from data_science_agent.utils.config import LLM_CASSETTE_DIR, LLM_CASSETTE_LATENCY, LLM_CASSETTE_MODE
+from data_science_agent.utils.llm_response_cache import load_generations, request_fingerprint
+
+CASSETTE_SUFFIX = ".json"
+
+
+class LLMCassette(BaseCache):
+    """
+    Records the LLM responses with their usage metadata and latency per request fingerprint, or replays the recorded
+    responses without querying the models. It hooks into the models like a response cache: in record mode every
+    lookup misses and the response is stored, when the model returns it; in replay mode every lookup is answered from
+    the recordings. Every recording is a file of its own, so the worker processes can record concurrently.
+
+    The same request may be recorded several times (e.g. repeated runs), it is replayed in the recorded order.
+    """
+
+    def __init__(self, directory: str, mode: str, replay_latency: bool = False):
+        """
+        :param directory: The directory of the recordings.
+        :param mode: "record" or "replay".
+        :param replay_latency: Whether replayed responses wait for their recorded latency.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._started: dict[tuple[int, str], float] = {}  # start of the pending requests by thread and fingerprint
+        self._replayed: dict[str, int] = defaultdict(int)  # replayed recordings by fingerprint
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list[Generation]]:
+        fingerprint = request_fingerprint(prompt, llm_string)
+        if self.mode == "record":
+            with self._lock:
+                self._started[(threading.get_ident(), fingerprint)] = time.perf_counter()
+            return None
+
+        recordings = sorted(glob.glob(os.path.join(self.directory, f"{fingerprint}-*{CASSETTE_SUFFIX}")))
+        if not recordings:
+            raise LookupError(f"No recorded LLM response for request {fingerprint} in {self.directory}.")
+        with self._lock:
+            index = self._replayed[fingerprint] % len(recordings)
+            self._replayed[fingerprint] += 1
+        with open(recordings[index], encoding="utf-8") as f:
+            recording = json.load(f)
+        if self.replay_latency:
+            time.sleep(recording["latency"])
+        return load_generations(json.dumps(recording["generations"]))
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if self.mode != "record":
+            return
+        fingerprint = request_fingerprint(prompt, llm_string)
+        with self._lock:
+            started = self._started.pop((threading.get_ident(), fingerprint), None)
+        recorded = time.time()
+        recording = {
+            "fingerprint": fingerprint,
+            "recorded": recorded,
+            "latency": time.perf_counter() - started if started is not None else 0.0,
+            "generations": json.loads(dumps(list(return_val))),
+        }
+        # the name starts with the time, so the recordings of a fingerprint are replayed in the recorded order
+        path = os.path.join(self.directory, f"{fingerprint}-{recorded:.6f}-{uuid.uuid4().hex[:8]}{CASSETTE_SUFFIX}")
+        atomic_write_bytes(path, json.dumps(recording, ensure_ascii=False).encode("utf-8"))
+
+    def clear(self, **kwargs) -> None:
+        for path in glob.glob(os.path.join(self.directory, f"*{CASSETTE_SUFFIX}")):
+            os.remove(path)
+
+
+_cassette: Optional[LLMCassette] = None
+
+
+def get_llm_cassette() -> Optional[LLMCassette]:
+    """Returns the cassette of the models, None if `LLM_CASSETTE_MODE` is "off"."""
+    global _cassette
+    if LLM_CASSETTE_MODE == "off":
+        return None
+    if _cassette is None:
+        _cassette = LLMCassette(LLM_CASSETTE_DIR, LLM_CASSETTE_MODE, LLM_CASSETTE_LATENCY)
+    return _cassette
@@ -31,10 +31,14 @@ class LLMMetadata:
     token_usage: TokenUsage
     cost_details: CostDetails
     model_name: str
+    prompt_tokens_saved: int = 0  # prompt tokens saved by condensing the prompt inputs (e.g. the metadata)
+    cache_hit: bool = False  # the response was loaded from the response cache, so it did not cost anything
 
     @classmethod
     def from_ai_message(cls, ai_message: AIMessage, calling_method_name) -> "LLMMetadata":
         """Create an LLMMetadata instance from an AIMessage containing response metadata."""
+        from data_science_agent.utils.llm_response_cache import is_cache_hit
+
         metadata = getattr(ai_message, "response_metadata", {}) or {}
         token_usage_data = metadata.get("token_usage", {}) or {}
         cost_details_data = token_usage_data.get("cost_details", {}) or {}
@@ -46,15 +50,21 @@ class LLMMetadata:
             total_tokens=token_usage_data.get("total_tokens")
         )
 
-        cost_details = CostDetails(
-            total_cost=token_usage_data.get("cost"),
-            cost_upstream_inference=cost_details_data.get("upstream_inference_cost"),
-            cost_upstream_inference_prompt=cost_details_data.get("upstream_inference_prompt_cost"),
-            cost_upstream_inference_completions=cost_details_data.get("upstream_inference_completion_cost")
-        )
+        cache_hit = is_cache_hit(ai_message)
+        if cache_hit:
+            # the cached message contains the costs of the original request
+            cost_details = CostDetails(total_cost=0.0, cost_upstream_inference=0.0, cost_upstream_inference_prompt=0.0,
+                                       cost_upstream_inference_completions=0.0)
+        else:
+            cost_details = CostDetails(
+                total_cost=token_usage_data.get("cost"),
+                cost_upstream_inference=cost_details_data.get("upstream_inference_cost"),
+                cost_upstream_inference_prompt=cost_details_data.get("upstream_inference_prompt_cost"),
+                cost_upstream_inference_completions=cost_details_data.get("upstream_inference_completion_cost")
+            )
 
         return cls(message=ai_message, token_usage=token_usage, cost_details=cost_details,
-                   method_name=calling_method_name, model_name=model_name)
+                   method_name=calling_method_name, model_name=model_name, cache_hit=cache_hit)
 
     def print_costs(self):
         """Print the token and cost summary."""
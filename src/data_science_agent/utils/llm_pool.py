@@ -0,0 +1,200 @@
+import asyncio
+import os
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from data_science_agent.utils.config import BASE_URL, OPENROUTER_API_KEY
+from data_science_agent.utils.enums import LLMModel
+
+if TYPE_CHECKING:
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+# settings of all models, they are part of the pool key, so changed settings create new clients
+LLM_SETTINGS = {
+    "base_url": BASE_URL,
+    "temperature": 0,  # for less hallucination
+    "max_tokens": 50000,
+    "timeout": 60,
+}
+# connections kept open per process, the models of all nodes are served by the same host
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 90  # seconds
+
+
+@dataclass
+class LLMPoolStats:
+    """Counters of the LLM client pool of the current process."""
+    hits: int
+    misses: int
+    size: int
+
+    def get_hit_rate(self) -> float:
+        """Returns the share of requested models, which were taken from the pool."""
+        return self.hits / max(self.hits + self.misses, 1)
+
+
+@dataclass
+class _LoopClients:
+    """The clients of one event loop, asynchronous connections can only be used by the loop, which opened them."""
+    http_async_client: "httpx.AsyncClient"
+    clients: dict[tuple, "ChatOpenAI"] = field(default_factory=dict)
+
+
+class _LLMPool:
+    """
+    Process-wide pool of `ChatOpenAI` clients keyed by model and settings. All clients share one HTTP connection pool
+    with keep-alive, so repeated requests reuse their TLS connections instead of opening new ones.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def after_fork(self) -> None:
+        """Starts the forked child with an empty pool, the lock may have been held by another thread of the parent."""
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # connections must not be shared with forked processes, so a child starts with an empty pool
+        self._pid = os.getpid()
+        self._clients: dict[tuple, "ChatOpenAI"] = {}
+        self._http_client: Optional["httpx.Client"] = None
+        # the clients of a loop are dropped with the loop, the loop is the key (its id may be reused by a new loop)
+        self._loop_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients] = \
+            weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: LLMModel) -> "ChatOpenAI":
+        """Returns the pooled client of the model, it is created with the first request."""
+        key = (model.value, tuple(sorted(LLM_SETTINGS.items())))
+        loop = _running_loop()
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            if loop is None:
+                clients = self._clients
+            else:
+                # asynchronous connections belong to the event loop, which opened them, so every loop gets own clients
+                self._drop_closed_loops()
+                if loop not in self._loop_clients:
+                    self._loop_clients[loop] = _LoopClients(http_async_client=self._create_http_client(True))
+                clients = self._loop_clients[loop].clients
+            client = clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
+            http_async_client = None if loop is None else self._loop_clients[loop].http_async_client
+            client = clients[key] = self._create(model, http_async_client)
+            return client
+
+    def _drop_closed_loops(self) -> None:
+        """Drops the clients of closed loops, which are still referenced (e.g. by their connections)."""
+        for loop in [loop for loop in self._loop_clients if loop.is_closed()]:
+            del self._loop_clients[loop]
+
+    def _create_http_client(self, asynchronous: bool = False):
+        """Creates a (asynchronous) HTTP client with the connection limits of the pool."""
+        import httpx
+
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                              keepalive_expiry=KEEPALIVE_EXPIRY)
+        timeout = httpx.Timeout(LLM_SETTINGS["timeout"])
+        if asynchronous:
+            return httpx.AsyncClient(limits=limits, timeout=timeout)
+        return httpx.Client(limits=limits, timeout=timeout)
+
+    def _create(self, model: LLMModel, http_async_client: Optional["httpx.AsyncClient"]) -> "ChatOpenAI":
+        """Creates the client of a model with the shared HTTP clients."""
+        # langchain_openai and the caches are imported with the first model, not when the utils are imported (e.g. by
+        # every worker)
+        from langchain_openai import ChatOpenAI
+        from data_science_agent.utils.llm_cassette import get_llm_cassette
+        from data_science_agent.utils.llm_response_cache import get_llm_response_cache
+
+        if self._http_client is None:
+            self._http_client = self._create_http_client()
+        return ChatOpenAI(
+            model=model.value,
+            api_key=OPENROUTER_API_KEY,
+            http_client=self._http_client,
+            http_async_client=http_async_client,
+            # recorded or replayed calls bypass the response cache, so the recordings contain every call
+            cache=get_llm_cassette() or get_llm_response_cache(),
+            default_headers={
+                "X-Provider": "openai",
+            },
+            **LLM_SETTINGS,
+        )
+
+    def get_stats(self) -> LLMPoolStats:
+        with self._lock:
+            size = len(self._clients) + sum(len(loop_clients.clients) for loop_clients in self._loop_clients.values())
+            return LLMPoolStats(hits=self.hits, misses=self.misses, size=size)
+
+    def clear(self) -> None:
+        """Closes the HTTP connections and removes all clients."""
+        with self._lock:
+            owned = self._pid == os.getpid()
+            http_client = self._http_client
+            loop_clients = list(self._loop_clients.items())
+            self._reset()
+        if not owned:
+            # the connections of a forked child belong to the parent
+            return
+        if http_client is not None:
+            http_client.close()
+        for loop, clients in loop_clients:
+            _close_async_client(loop, clients.http_async_client)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Returns the running event loop, None outside of asyncio."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _close_async_client(loop: asyncio.AbstractEventLoop, client: "httpx.AsyncClient") -> None:
+    """Closes an asynchronous HTTP client on its event loop, the clients of closed loops are only dropped."""
+    if loop.is_closed():
+        return
+    if loop.is_running():
+        # e.g. the loop of the calling coroutine or of another thread, the client is closed by the loop
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        loop.run_until_complete(client.aclose())
+
+
+_pool = _LLMPool()
+# forked workers (e.g. of a ProcessPoolExecutor) must not reuse the connections of the parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_pool.after_fork)
+
+
+def get_pooled_llm_model(model: LLMModel) -> "ChatOpenAI":
+    """
+    Returns the client of the model from the process-wide pool. The client is thread-safe and shared by all nodes
+    requesting the model with the same settings.
+
+    :param model: The model.
+    :return: The pooled client.
+    """
+    return _pool.get(model)
+
+
+def get_llm_pool_stats() -> LLMPoolStats:
+    """Returns the hit and miss counters of the LLM client pool of the current process."""
+    return _pool.get_stats()
+
+
+def clear_llm_pool() -> None:
+    """Closes the pooled HTTP connections of the current process and removes all clients."""
+    _pool.clear()
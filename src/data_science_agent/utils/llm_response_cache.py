@@ -0,0 +1,183 @@
+import hashlib
+import os
+import sqlite3
+import time
+import warnings
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+from data_science_agent.utils.config import LLM_CACHE_EXCLUDED_NODES, LLM_CACHE_MAX_MB, LLM_CACHE_PATH, \
+    LLM_CACHE_TTL_HOURS
+from data_science_agent.utils.enums import Color
+from data_science_agent.utils.print_color import print_color
+
+# bump this version, whenever the cached values change, so outdated entries are not used anymore
+LLM_CACHE_VERSION = 1
+# key of the response metadata marking messages, which were loaded from the cache
+CACHE_HIT_KEY = "cache_hit"
+# seconds a worker waits for the write lock of another worker
+BUSY_TIMEOUT = 30
+
+# the node calling the LLM, set by `llm_cache_scope`, nodes in `LLM_CACHE_EXCLUDED_NODES` do not use the cache
+_current_node: ContextVar[Optional[str]] = ContextVar("llm_cache_node", default=None)
+
+
+@contextmanager
+def llm_cache_node(node: str) -> Iterator[None]:
+    """Marks the LLM calls inside the block as calls of the node, e.g. to exclude them from the response cache."""
+    token = _current_node.set(node)
+    try:
+        yield
+    finally:
+        _current_node.reset(token)
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    Persistent cache of LLM responses in a SQLite database in WAL mode, which is shared by all worker processes. The
+    key is the hash of the model with its settings, the bound response schema and the messages (the `llm_string` and
+    `prompt` of langchain), so only byte-identical requests hit. Entries expire after `ttl_seconds` and the least
+    recently used entries are evicted above `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: float = 0, excluded_nodes: Sequence[str] = ()):
+        """
+        :param path: The path of the database file.
+        :param max_bytes: The maximum size of the cached responses.
+        :param ttl_seconds: The lifetime of the entries, 0 for no expiry.
+        :param excluded_nodes: The nodes, which do not use the cache.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.excluded_nodes = frozenset(excluded_nodes)
+        self._warned_unscoped = False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            # WAL allows readers while another worker writes, the mode is stored in the database file
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # every call opens its own connection, so the cache is safe in threads and forked workers
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _is_enabled(self) -> bool:
+        node = _current_node.get()
+        if node is None and self.excluded_nodes and not self._warned_unscoped:
+            self._warned_unscoped = True
+            print_color("LLM call outside of a node, it is cached regardless of LLM_CACHE_EXCLUDED_NODES. Decorate the "
+                        "node with `track_duration` or `llm_cache_scope`.", Color.WARNING)
+        return node not in self.excluded_nodes
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list[Generation]]:
+        if not self._is_enabled():
+            return None
+        key = request_fingerprint(prompt, llm_string)
+        now = time.time()
+        try:
+            with closing(self._connect()) as connection, connection:
+                row = connection.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                    connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            generations = load_generations(row[0])
+        except Exception as e:
+            print_color(f"Could not read cached LLM response {key}: {e}", Color.WARNING)
+            return None
+
+        for generation in generations:
+            if isinstance(generation, ChatGeneration):
+                generation.message.response_metadata[CACHE_HIT_KEY] = True
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if not self._is_enabled():
+            return
+        key = request_fingerprint(prompt, llm_string)
+        value = dumps(list(return_val))
+        now = time.time()
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now)
+                )
+                self._evict(connection, now)
+        except Exception as e:
+            print_color(f"Could not cache LLM response {key}: {e}", Color.WARNING)
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        """Deletes the expired entries and the least recently used ones above the maximum size."""
+        if self.ttl_seconds:
+            connection.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total - freed <= self.max_bytes:
+                break
+            evicted.append((key,))
+            freed += size
+        connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self, **kwargs) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM responses")
+
+
+def load_generations(value: str) -> list[Generation]:
+    """Loads generations, which were serialized with `langchain_core.load.dumps`."""
+    with warnings.catch_warnings():
+        # the values were written by the agent and contain only generations and messages
+        warnings.simplefilter("ignore")
+        return loads(value, allowed_objects=[ChatGeneration, AIMessage])
+
+
+def request_fingerprint(prompt: str, llm_string: str) -> str:
+    """Returns the fingerprint of a request, the hash of the model settings (with the response schema) and messages."""
+    digest = hashlib.sha256(llm_string.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return f"v{LLM_CACHE_VERSION}-{digest.hexdigest()}"
+
+
+_response_cache: Optional[SQLiteResponseCache] = None
+
+
+def get_llm_response_cache() -> Optional[SQLiteResponseCache]:
+    """Returns the response cache of the models, None if it is disabled (`LLM_CACHE_MAX_MB` is 0)."""
+    global _response_cache
+    if LLM_CACHE_MAX_MB <= 0:
+        return None
+    if _response_cache is None:
+        _response_cache = SQLiteResponseCache(
+            LLM_CACHE_PATH,
+            max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+            ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+            excluded_nodes=LLM_CACHE_EXCLUDED_NODES,
+        )
+    return _response_cache
+
+
+def is_cache_hit(message: AIMessage) -> bool:
+    """Returns whether the message was loaded from the response cache."""
+    return bool((getattr(message, "response_metadata", None) or {}).get(CACHE_HIT_KEY))
@@ -1,26 +1,17 @@
 import os
 import shutil
+from typing import TYPE_CHECKING
 
-from langchain_openai import ChatOpenAI
-
-from data_science_agent.utils import OPENROUTER_API_KEY, BASE_URL
 from data_science_agent.utils.enums import LLMModel
+from data_science_agent.utils.llm_pool import get_pooled_llm_model
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 
-def get_llm_model(model: LLMModel) -> ChatOpenAI:
-    """Returns the LLM model instance based on the selected model."""
-    llm = ChatOpenAI(
-        model=model.value,
-        api_key=OPENROUTER_API_KEY,
-        base_url=BASE_URL,
-        temperature=0,  # for less hallucination
-        max_tokens=50000,
-        timeout=60,
-        default_headers={
-            "X-Provider": "openai",
-        }
-    )
-    return llm
+def get_llm_model(model: LLMModel) -> "ChatOpenAI":
+    """Returns the LLM model instance based on the selected model, it is shared by all calls in the process."""
+    return get_pooled_llm_model(model)
 
 
 def clear_output_dir(path: str):
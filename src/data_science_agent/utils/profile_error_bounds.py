@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ProfileErrorBounds:
+    """Keeps track of the error bounds of an approximately profiled dataset column, None means exact."""
+    column_name: str
+    quantile_rank_error: Optional[float]  # max. rank error of min. / percentiles / max. as fraction of the count
+    unique_relative_error: Optional[float]  # standard error of the distinct count as fraction of the count
+    freq_error: Optional[int]  # max. number of occurrences, the frequency of the top value is underestimated by
+
+    def is_exact(self) -> bool:
+        """Returns True, if all statistics of the column are exact."""
+        return self.quantile_rank_error is None and self.unique_relative_error is None and self.freq_error is None
@@ -0,0 +1,40 @@
+import math
+import os
+from functools import lru_cache
+
+from data_science_agent.utils.config import TIKTOKEN_CACHE_DIR
+from data_science_agent.utils.print_color import print_color
+from data_science_agent.utils.enums import Color
+
+# encoding of the current OpenAI models, the other models use similar vocabularies
+TOKEN_ENCODING = "o200k_base"
+# rough average of characters per token, used if the encoding is not available
+CHARS_PER_TOKEN = 4
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts the tokens of a text with tiktoken. Without the encoding file (e.g. offline before it was downloaded to
+    `TIKTOKEN_CACHE_DIR`), the tokens are estimated from the number of characters.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Loads the token encoding once, None if it is not available."""
+    # tiktoken downloads the encoding file only once into its cache directory, afterwards it is loaded locally
+    os.environ["TIKTOKEN_CACHE_DIR"] = TIKTOKEN_CACHE_DIR
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        print_color(
+            f"Token encoding '{TOKEN_ENCODING}' is neither in {TIKTOKEN_CACHE_DIR} nor downloadable, tokens are "
+            f"estimated: {e}",
+            Color.WARNING
+        )
+        return None
@@ -0,0 +1,85 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Iterator, Optional, overload
+
+from pydantic import BaseModel
+
+
+class TripleStore(Sequence):
+    """
+    Compact, read-only list of RDF triples. Every distinct string (URIs, literals) is stored once and interned, the
+    triples are three arrays of term ids. Items are returned as triple DTOs (e.g. `Metadata`), which are created on
+    access. The string representation equals the one of a list of those DTOs and is rendered only once, so prompts
+    can use `str(store)` repeatedly without rendering every triple again.
+    """
+    __slots__ = ("_dto", "_terms", "_subjects", "_predicates", "_objects", "_rendered")
+
+    def __init__(self, triples: Iterable[tuple[str, str, str]], dto: type[BaseModel]):
+        """
+        :param triples: The (subject, predicate, object) triples.
+        :param dto: The DTO class of a triple with the fields subject, predicate and object.
+        """
+        self._dto = dto
+        self._terms: list[str] = []
+        term_ids: dict[str, int] = {}
+        self._subjects, self._predicates, self._objects = array("I"), array("I"), array("I")
+        for triple in triples:
+            for ids, term in zip((self._subjects, self._predicates, self._objects), triple):
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(self._terms)
+                    self._terms.append(sys.intern(term))
+                ids.append(term_id)
+        self._rendered: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._subjects)
+
+    @overload
+    def __getitem__(self, index: int) -> BaseModel: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[BaseModel]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        subject, predicate, obj = self.get_triple(index)
+        # the terms were already validated strings, so the DTO is created without validation
+        return self._dto.model_construct(subject=subject, predicate=predicate, object=obj)
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def get_triple(self, index: int) -> tuple[str, str, str]:
+        """Returns the triple at the index as plain strings."""
+        terms = self._terms
+        return terms[self._subjects[index]], terms[self._predicates[index]], terms[self._objects[index]]
+
+    def iter_triples(self) -> Iterator[tuple[str, str, str]]:
+        """Yields the triples as plain strings, without creating DTOs."""
+        terms = self._terms
+        for subject, predicate, obj in zip(self._subjects, self._predicates, self._objects):
+            yield terms[subject], terms[predicate], terms[obj]
+
+    def __str__(self) -> str:
+        if self._rendered is None:
+            name = self._dto.__name__
+            self._rendered = "[" + ", ".join(
+                f"{name}(subject={subject!r}, predicate={predicate!r}, object={obj!r})"
+                for subject, predicate, obj in self.iter_triples()
+            ) + "]"
+        return self._rendered
+
+    __repr__ = __str__
+
+    def __getstate__(self):
+        # the rendering is cheap to restore and would double the pickled size
+        return self._dto, self._terms, self._subjects, self._predicates, self._objects
+
+    def __setstate__(self, state) -> None:
+        self._dto, self._terms, self._subjects, self._predicates, self._objects = state
+        self._terms = [sys.intern(term) for term in self._terms]
+        self._rendered = None
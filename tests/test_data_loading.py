@@ -0,0 +1,38 @@
+import pytest
+
+from data_science_agent.pipeline import data_loading, dataset_cache
+from data_science_agent.pipeline.data_loading import load_dataset, prepare_shared_dataset
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_DIR", str(directory))
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_MAX_MB", 100)
+    return directory
+
+
+@pytest.fixture
+def large_dataset(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loading, "DATASET_STREAMING_MIN_MB", 1)
+    path = tmp_path / "dataset.csv"
+    path.write_text("id,name\n" + "".join(f"{row},name {row}\n" for row in range(100_000)), encoding="utf-8")
+    assert path.stat().st_size > 1024 * 1024
+    return str(path)
+
+
+def test_streamed_datasets_are_not_prepared(cache_dir, large_dataset):
+    assert prepare_shared_dataset(large_dataset) is None
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_study_workers_stream_large_datasets(cache_dir, large_dataset):
+    # like rq_continous: the parent prepares the dataset, the workers load it with the returned key
+    state = {"dataset_path": large_dataset, "dataset_cache_key": prepare_shared_dataset(large_dataset),
+             "durations": []}
+
+    state = load_dataset(state)
+    assert state["dataset"].streamed
+    assert state["dataset"].row_count == 100_000
+    assert list(cache_dir.iterdir()) == []
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from data_science_agent.pipeline import dataset_cache
+from data_science_agent.pipeline.data_loading import read_dataframe
+from data_science_agent.pipeline.dataset_cache import (
+    CachedDataset, dataset_cache_key, load_cached_dataset, store_cached_dataset
+)
+
+CSV = "name,city,age,score\nAnna,Berlin,31,1.5\nBen,,42,\nCarla,Hamburg,,2.25\n"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_DIR", str(directory))
+    monkeypatch.setattr(dataset_cache, "DATASET_CACHE_MAX_MB", 100)
+    return directory
+
+
+def test_cache_hit_has_the_dtypes_of_the_parsed_file(tmp_path, cache_dir):
+    path = tmp_path / "dataset.csv"
+    path.write_text(CSV, encoding="utf-8")
+    parsed = CachedDataset(*read_dataframe(str(path)))
+    key = dataset_cache_key(str(path))
+
+    store_cached_dataset(key, parsed)
+    cached = load_cached_dataset(key)
+
+    assert cached is not None
+    assert cached.df.dtypes.to_dict() == parsed.df.dtypes.to_dict()
+    pd.testing.assert_frame_equal(cached.df, parsed.df)
@@ -0,0 +1,21 @@
+import pandas as pd
+import pytest
+
+from data_science_agent.pipeline.profile_cache import column_content_key
+
+VALUES = ["b", "a", "c", "a", "b", None]
+
+
+@pytest.mark.parametrize("dtype", ["str", "string"])
+def test_string_dtypes_share_the_key(dtype):
+    assert column_content_key(pd.Series(VALUES, dtype=object)) == column_content_key(pd.Series(VALUES, dtype=dtype))
+
+
+def test_categorical_columns_have_keys_of_their_own():
+    column = pd.Series(VALUES, dtype=object)
+    categorical = column.astype("category")
+    reordered = column.astype(pd.CategoricalDtype(["c", "b", "a"]))
+
+    keys = {column_content_key(column), column_content_key(categorical), column_content_key(reordered)}
+    assert len(keys) == 3
+    assert column_content_key(categorical) == column_content_key(column.astype("category"))
@@ -0,0 +1,17 @@
+import pytest
+
+from data_science_agent.language import PROMPT_REGISTRY, Prompt
+from data_science_agent.utils.enums import Language
+
+
+def test_prompts_are_registered_by_their_name():
+    prompt = Prompt(de={"system": "Hallo {name}"}, en={"system": "Hello {name}"}, name="test_greeting")
+
+    assert PROMPT_REGISTRY["test_greeting"] is prompt
+    assert prompt.get_prompt(Language.EN, "system", name="Ada") == "Hello Ada"
+
+
+@pytest.mark.parametrize("name", ["", None])
+def test_prompts_need_a_name(name):
+    with pytest.raises(ValueError):
+        Prompt(de={"system": "Hallo"}, en={"system": "Hello"}, name=name)
@@ -0,0 +1,155 @@
+import re
+from pathlib import Path
+
+import pytest
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+
+from data_science_agent.pipeline.rdf_parsing import iter_rdf_triples
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "src" / "resources" / "data"
+METADATA_FILES = sorted(DATA_DIR.glob("*/*/metadata.rdf"))
+# blank nodes of the streaming parser are numbered with 32 hex digits (see `iter_rdf_triples`), the leading zeros
+# tell them apart from literals like exported rdflib blank node ids
+BLANK_NODE = re.compile(r"N0{16}[0-9a-f]{16}")
+
+
+def _term(value: str, position: int):
+    """Converts a string of the streaming parser to an rdflib term, objects are compared as strings."""
+    if BLANK_NODE.fullmatch(value):
+        return BNode(value)
+    return URIRef(value) if position < 2 else Literal(value)
+
+
+def _streaming_graph(path: Path, excluded_predicates=frozenset()) -> Graph:
+    graph = Graph()
+    for triple in iter_rdf_triples(str(path), excluded_predicates):
+        graph.add(tuple(_term(value, position) for position, value in enumerate(triple)))
+    return graph
+
+
+def _rdflib_graph(path: Path, excluded_predicates=frozenset()) -> Graph:
+    """Parses the file with rdflib, URIs and literals as objects are reduced to their strings like `str()`."""
+    parsed = Graph()
+    parsed.parse(path, format="xml")
+    graph = Graph()
+    for s, p, o in parsed:
+        if str(p) not in excluded_predicates:
+            graph.add((s, p, o if isinstance(o, BNode) else Literal(str(o))))
+    return graph
+
+
+def _assert_parity(path: Path, excluded_predicates=frozenset()) -> None:
+    streamed = _streaming_graph(path, excluded_predicates)
+    expected = _rdflib_graph(path, excluded_predicates)
+    assert len(streamed) == len(expected)
+    # the blank nodes are canonicalized, their labels differ between the parsers
+    assert isomorphic(streamed, expected)
+
+
+def test_metadata_files_are_bundled():
+    assert METADATA_FILES
+
+
+@pytest.mark.parametrize("path", METADATA_FILES, ids=lambda path: path.parent.name)
+def test_metadata_files_match_rdflib(path):
+    _assert_parity(path)
+
+
+def test_excluded_predicates_match_rdflib():
+    excluded = {"http://purl.org/dc/terms/description", "http://www.w3.org/ns/dcat#distribution"}
+    for path in METADATA_FILES[:5]:
+        _assert_parity(path, excluded)
+
+
+DOCUMENTS = {
+    "about_and_id": """
+        <rdf:Description rdf:about="http://example.org/a">
+            <ex:p rdf:resource="#b"/>
+        </rdf:Description>
+        <ex:Thing rdf:ID="b" ex:attribute="value"/>
+        <rdf:Description rdf:about="relative">
+            <ex:p rdf:nodeID="shared"/>
+        </rdf:Description>
+        <rdf:Description rdf:nodeID="shared" ex:q="x"/>
+    """,
+    "xml_lang": """
+        <rdf:Description rdf:about="http://example.org/a" xml:lang="de">
+            <ex:title>Titel</ex:title>
+            <ex:title xml:lang="en">Title</ex:title>
+            <ex:title xml:lang="">Untagged</ex:title>
+        </rdf:Description>
+    """,
+    "typed_literals": """
+        <rdf:Description rdf:about="http://example.org/a">
+            <ex:count rdf:datatype="http://www.w3.org/2001/XMLSchema#integer">42</ex:count>
+            <ex:date rdf:datatype="http://www.w3.org/2001/XMLSchema#date">2024-01-31</ex:date>
+            <ex:empty></ex:empty>
+        </rdf:Description>
+    """,
+    "nested_blank_nodes": """
+        <rdf:Description rdf:about="http://example.org/a">
+            <ex:contact>
+                <rdf:Description>
+                    <ex:name>Name</ex:name>
+                    <ex:address>
+                        <ex:Address ex:city="Kiel">
+                            <ex:street>Straße 1</ex:street>
+                        </ex:Address>
+                    </ex:address>
+                </rdf:Description>
+            </ex:contact>
+            <ex:empty ex:attribute="value"/>
+        </rdf:Description>
+    """,
+    "parse_type_resource": """
+        <rdf:Description rdf:about="http://example.org/a">
+            <ex:period rdf:parseType="Resource">
+                <ex:start>2020</ex:start>
+                <ex:end rdf:parseType="Resource"><ex:year>2021</ex:year></ex:end>
+            </ex:period>
+        </rdf:Description>
+    """,
+    "parse_type_collection": """
+        <rdf:Description rdf:about="http://example.org/a">
+            <ex:items rdf:parseType="Collection">
+                <rdf:Description rdf:about="http://example.org/first"/>
+                <rdf:Description><ex:name>second</ex:name></rdf:Description>
+            </ex:items>
+            <ex:none rdf:parseType="Collection"/>
+        </rdf:Description>
+    """,
+    "parse_type_literal": """
+        <rdf:Description rdf:about="http://example.org/a">
+            <ex:text rdf:parseType="Literal">Text with <ex:b>markup</ex:b> and <ex:i a="1">attributes</ex:i></ex:text>
+            <ex:html rdf:parseType="Literal">A &amp; B &lt; C <p xmlns="http://www.w3.org/1999/xhtml" xml:lang="de"
+                >x <em>"y"</em><br/></p> <ex:b ex:attribute='a "quote"'><ex:c/></ex:b></ex:html>
+            <ex:after>after</ex:after>
+        </rdf:Description>
+    """,
+    "containers": """
+        <rdf:Bag rdf:about="http://example.org/bag">
+            <rdf:li>one</rdf:li>
+            <rdf:li rdf:resource="http://example.org/two"/>
+            <rdf:_5>five</rdf:_5>
+        </rdf:Bag>
+    """,
+    "xml_base": """
+        <rdf:Description rdf:about="a" xml:base="http://example.org/base/">
+            <ex:p rdf:resource="b"/>
+            <ex:q xml:base="http://other.org/"><rdf:Description rdf:about="c"/></ex:q>
+        </rdf:Description>
+    """,
+}
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_documents_match_rdflib(name, tmp_path):
+    path = tmp_path / "metadata.rdf"
+    path.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:ex="http://example.org/terms#">'
+        f"{DOCUMENTS[name]}</rdf:RDF>",
+        encoding="utf-8",
+    )
+    _assert_parity(path)
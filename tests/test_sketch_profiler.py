@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_science_agent.pipeline.sketch_profiler import FREQUENT_ITEMS_CAPACITY, FrequentItemsSketch, \
+    sketch_profile_columns
+
+CHUNK_ROWS = 37
+
+
+def _chunks(df: pd.DataFrame):
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS]
+
+
+def _profile(column: pd.Series):
+    df = pd.DataFrame({"column": column})
+    profiles, error_bounds = sketch_profile_columns(_chunks(df), {"column": str(column.dtype)})
+    return profiles[0], error_bounds[0]
+
+
+# the default string dtype of pandas 3, astype("str") of pandas 2 would turn the missing values into "None"
+@pytest.mark.parametrize("dtype", [object, pd.StringDtype(na_value=np.nan), "category"],
+                         ids=["object", "str", "category"])
+@pytest.mark.parametrize("distinct", [1, 2, 10, FREQUENT_ITEMS_CAPACITY])
+def test_frequent_items_are_exact_up_to_capacity(dtype, distinct):
+    rng = np.random.default_rng(distinct)
+    values = pd.Series([f"value {value}" for value in rng.integers(0, distinct, 500)], dtype=object)
+    values[rng.random(len(values)) < 0.1] = None
+    column = values.astype(dtype)
+
+    profile, error_bounds = _profile(column)
+    expected = column.describe()
+    assert (profile["unique"], profile["top"], profile["freq"]) == (expected["unique"], expected["top"],
+                                                                    expected["freq"])
+    assert error_bounds.freq_error is None
+
+
+@pytest.mark.parametrize("distinct", [FREQUENT_ITEMS_CAPACITY, FREQUENT_ITEMS_CAPACITY + 1, 122, 500])
+def test_frequent_items_keep_ties_of_unique_values(distinct):
+    # every value occurs once, so all counters tie at the cut
+    column = pd.Series([f"https://example.org/{value}.jpg" for value in range(distinct)], dtype=object)
+
+    profile, _ = _profile(column)
+    assert profile["top"] is not None
+    assert profile["freq"] == 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_frequent_items_bound_the_frequency_above_capacity(seed):
+    rng = np.random.default_rng(seed)
+    column = pd.Series(rng.zipf(1.3, 2000) % 1000).astype(str)
+
+    sketch = FrequentItemsSketch()
+    for chunk in _chunks(pd.DataFrame({"column": column})):
+        sketch.update(chunk["column"].value_counts(sort=False))
+    assert len(sketch.counters) == FREQUENT_ITEMS_CAPACITY
+    assert 0 < sketch.error <= len(column) / FREQUENT_ITEMS_CAPACITY
+
+    counts = column.value_counts()
+    for value, count in sketch.counters.items():
+        assert count - sketch.errors[value] <= counts[value] <= count
+    top, freq = sketch.top()
+    assert counts.iloc[0] - sketch.error <= freq <= counts[top]